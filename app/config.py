@@ -61,6 +61,7 @@ class WorkerConfig:
     queue_maxsize: int
     gateway_not_work_event_throttle_seconds: int
     waiting_for_market_data_event_throttle_seconds: int
+    pin_to_cpu: bool = False
 
 
 @dataclass(frozen=True)
@@ -575,6 +576,7 @@ def load_app_config() -> AppConfig:
             minimum=10,
             maximum=86400,
         ),
+        pin_to_cpu=_as_bool(worker_raw.get("pin_to_cpu"), False),
     )
     providers = ProvidersConfig(
         broker_data=_normalize_broker_data_provider(
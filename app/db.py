@@ -9,6 +9,19 @@ from .runtime_paths import resolve_data_dir
 
 DEFAULT_DB_PATH = resolve_data_dir() / "ibx.sqlite3"
 SCHEMA_PATH = Path(__file__).with_name("sql").joinpath("schema_v1.sql")
+# Canonical `YYYY-MM-DDTHH:MM:SSZ` expiry, so callers can compare it with ISO timestamps as text.
+EFFECTIVE_EXPIRE_AT_SQL = """
+COALESCE(
+  strftime('%Y-%m-%dT%H:%M:%SZ', expire_at),
+  CASE
+    WHEN expire_mode = 'relative' AND expire_in_seconds > 0 THEN strftime(
+      '%Y-%m-%dT%H:%M:%SZ',
+      COALESCE(NULLIF(logical_activated_at, ''), activated_at),
+      '+' || expire_in_seconds || ' seconds'
+    )
+  END
+)
+"""
 
 
 def resolve_db_path(db_path: str | Path | None = None) -> Path:
@@ -296,9 +309,10 @@ def _migrate_schema(conn: sqlite3.Connection) -> None:
     )
     conn.execute("DROP VIEW IF EXISTS v_strategies_active")
     conn.execute(
-        """
+        f"""
         CREATE VIEW v_strategies_active AS
-        SELECT * FROM strategies WHERE is_deleted = 0
+        SELECT *, {EFFECTIVE_EXPIRE_AT_SQL} AS effective_expire_at
+        FROM strategies WHERE is_deleted = 0
         """
     )
 
@@ -139,6 +139,11 @@ class IBClientSession:
                         self._in_flight -= 1
                         self._last_used_monotonic = time.monotonic()
 
+                elif command == "connect":
+                    self._connect_worker()
+                    self._last_used_monotonic = time.monotonic()
+                    if not fut.done(): fut.set_result(None)
+
                 elif command == "reap":
                     closed = self._disconnect_if_idle_worker(now_monotonic=payload)
                     if not fut.done(): fut.set_result(closed)
@@ -178,6 +183,9 @@ class IBClientSession:
     def run(self, callback: Callable[[Any], Any]) -> Any:
         return self._submit("run", callback).result()
 
+    def connect_async(self) -> Future[None]:
+        return self._submit("connect")
+
     def close_if_idle(self, *, now_monotonic: float | None = None) -> bool:
         return bool(self._submit("reap", now_monotonic).result())
 
@@ -240,6 +248,12 @@ class IBSessionManager:
             self._sessions[key] = session
             return session
 
+    def prewarm(self, sessions: list[IBClientSession]) -> None:
+        """并发建立连接：每个 session 有独立工作线程，先全部提交再统一等待"""
+        futures = [session.connect_async() for session in sessions]
+        for fut in futures:
+            fut.result()
+
     def close_all(self) -> None:
         with self._lock:
             sessions = list(self._sessions.values())
@@ -247,10 +261,10 @@ class IBSessionManager:
         for session in sessions:
             session.stop()
 
-    def reap_once(self) -> None:
+    def reap_once(self, *, now_monotonic: float | None = None) -> None:
         with self._lock:
             sessions = list(self._sessions.values())
-        now = time.monotonic()
+        now = time.monotonic() if now_monotonic is None else float(now_monotonic)
         for session in sessions:
             session.close_if_idle(now_monotonic=now)
 
@@ -9,7 +9,7 @@ from .api import router as v1_router
 from .logging_config import configure_logging
 from .runtime_paths import ensure_runtime_dirs
 from .store import store
-from .worker import worker_engine
+from .worker import get_worker_engine
 
 
 def create_app() -> FastAPI:
@@ -34,11 +34,11 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     def on_startup() -> None:
         logging.getLogger("").info("IBX API startup complete; logs=%s", log_path)
-        worker_engine.start_if_enabled()
+        get_worker_engine().start_if_enabled()
 
     @app.on_event("shutdown")
     def on_shutdown() -> None:
-        worker_engine.stop()
+        get_worker_engine().stop()
         store.shutdown()
 
     return app
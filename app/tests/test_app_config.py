@@ -50,6 +50,7 @@ def test_load_app_config_from_conf_file(tmp_path: Path) -> None:
         queue_maxsize = 8000
         gateway_not_work_event_throttle_seconds = 600
         waiting_for_market_data_event_throttle_seconds = 180
+        pin_to_cpu = true
         """,
     )
 
@@ -76,6 +77,7 @@ def test_load_app_config_from_conf_file(tmp_path: Path) -> None:
         assert cfg.worker.queue_maxsize == 8000
         assert cfg.worker.gateway_not_work_event_throttle_seconds == 600
         assert cfg.worker.waiting_for_market_data_event_throttle_seconds == 180
+        assert cfg.worker.pin_to_cpu is True
         assert cfg.providers.broker_data == "ib"
         assert cfg.providers.market_data == "ib"
     finally:
@@ -114,3 +114,67 @@ def test_active_view_excludes_soft_deleted_strategies(tmp_path: Path) -> None:
             assert active_rows is not None
             assert total_rows["c"] == 1
             assert active_rows["c"] == 0
+
+
+def test_active_view_exposes_effective_expire_at(tmp_path: Path) -> None:
+    db_path = tmp_path / "ibx_test.sqlite3"
+    init_db(db_path=db_path)
+
+    with get_connection(db_path) as conn:
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO strategies (
+                    id, description, trade_type, currency, upstream_only_activation,
+                    expire_mode, expire_in_seconds, status, condition_logic, conditions_json,
+                    created_at, updated_at, activated_at, logical_activated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    "S-EXPIRE-REL",
+                    "relative expiry",
+                    "buy",
+                    "USD",
+                    0,
+                    "relative",
+                    90,
+                    "ACTIVE",
+                    "AND",
+                    "[]",
+                    "2026-02-21T00:00:00Z",
+                    "2026-02-21T00:00:00Z",
+                    "2026-02-21T00:00:00Z",
+                    "2026-02-21T00:10:00Z",
+                ),
+            )
+            conn.execute(
+                """
+                INSERT INTO strategies (
+                    id, description, trade_type, currency, upstream_only_activation,
+                    expire_mode, expire_at, status, condition_logic, conditions_json,
+                    created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    "S-EXPIRE-ABS",
+                    "absolute expiry",
+                    "buy",
+                    "USD",
+                    0,
+                    "absolute",
+                    "2026-02-22T08:00:00+08:00",
+                    "ACTIVE",
+                    "AND",
+                    "[]",
+                    "2026-02-21T00:00:00Z",
+                    "2026-02-21T00:00:00Z",
+                ),
+            )
+
+            rows = conn.execute(
+                "SELECT id, effective_expire_at FROM v_strategies_active ORDER BY id"
+            ).fetchall()
+            assert {row["id"]: row["effective_expire_at"] for row in rows} == {
+                "S-EXPIRE-ABS": "2026-02-22T00:00:00Z",
+                "S-EXPIRE-REL": "2026-02-21T00:11:30Z",
+            }
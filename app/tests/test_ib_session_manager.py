@@ -173,3 +173,61 @@ def test_session_manager_closes_idle_connection_and_reconnects_on_next_request()
         assert fake.connect_calls == 2
     finally:
         manager.close_all()
+
+
+def test_session_manager_reap_once_accepts_logical_now() -> None:
+    fake = _FakeIB()
+    manager = IBSessionManager(ib_factory=lambda: fake, sweep_interval_seconds=0.5)
+    try:
+        session = manager.get_session(
+            host="127.0.0.1",
+            port=4002,
+            client_id=99,
+            timeout_seconds=5.0,
+            readonly=True,
+            idle_ttl_seconds=30.0,
+        )
+        session.run(lambda ib: bool(ib.isConnected()))
+
+        manager.reap_once()
+        assert fake.disconnect_calls == 0
+
+        manager.reap_once(now_monotonic=time.monotonic() + 31.0)
+        assert fake.disconnect_calls == 1
+
+        session.run(lambda ib: bool(ib.isConnected()))
+        assert fake.connect_calls == 2
+    finally:
+        manager.close_all()
+
+
+def test_session_manager_prewarm_connects_each_session_once() -> None:
+    fakes: list[_FakeIB] = []
+
+    def _factory() -> _FakeIB:
+        fake = _FakeIB()
+        fakes.append(fake)
+        return fake
+
+    manager = IBSessionManager(ib_factory=_factory, sweep_interval_seconds=0.5)
+    try:
+        sessions = [
+            manager.get_session(
+                host="127.0.0.1",
+                port=4002,
+                client_id=client_id,
+                timeout_seconds=5.0,
+                readonly=True,
+                idle_ttl_seconds=30.0,
+            )
+            for client_id in (99, 100, 101)
+        ]
+        manager.prewarm(sessions)
+        assert len(fakes) == 3
+        assert all(fake.connect_calls == 1 for fake in fakes)
+
+        for session in sessions:
+            session.run(lambda ib: bool(ib.isConnected()))
+        assert all(fake.connect_calls == 1 for fake in fakes)
+    finally:
+        manager.close_all()
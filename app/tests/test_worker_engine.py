@@ -245,6 +245,54 @@ def test_strategy_task_queue_deduplicates_inflight() -> None:
     assert task_queue.enqueue(task) is True
 
 
+def test_strategy_task_queue_claim_many_skips_inflight() -> None:
+    task_queue = StrategyTaskQueue(maxsize=8)
+    assert task_queue.claim("S-TQ-BATCH-1") is True
+
+    accepted = task_queue.claim_many(["S-TQ-BATCH-1", "S-TQ-BATCH-2", "S-TQ-BATCH-3"])
+
+    assert accepted == {"S-TQ-BATCH-2", "S-TQ-BATCH-3"}
+    assert task_queue.inflight_count() == 3
+    task = StrategyTask(
+        strategy_id="S-TQ-BATCH-2",
+        reason="unit_test",
+        expected_status="ACTIVE",
+        expected_version=1,
+        enqueued_at=datetime.now(UTC),
+    )
+    assert task_queue.enqueue_prebuilt(task) is True
+    assert task_queue.qsize() == 1
+
+
+def test_strategy_task_queue_idle_shard_steals_pending_task() -> None:
+    task_queue = StrategyTaskQueue(maxsize=8, shards=4)
+    task = StrategyTask(
+        strategy_id="S-TQ-STEAL",
+        reason="unit_test",
+        expected_status="ACTIVE",
+        expected_version=1,
+        enqueued_at=datetime.now(UTC),
+    )
+    assert task_queue.enqueue(task) is True
+    owner = hash(task.strategy_id) % task_queue.shard_count()
+
+    popped = task_queue.pop(timeout=0.01, shard_index=owner + 1)
+
+    assert popped is not None
+    assert popped.strategy_id == "S-TQ-STEAL"
+    assert task_queue.enqueue(task) is False
+    task_queue.mark_done(popped.strategy_id)
+    assert task_queue.inflight_count() == 0
+
+
+def test_strategy_task_queue_wake_unblocks_idle_pop() -> None:
+    task_queue = StrategyTaskQueue(maxsize=8, shards=2)
+    task_queue.wake(1)
+
+    assert task_queue.pop(shard_index=1) is None
+    assert task_queue.pop(timeout=0.01) is None
+
+
 def test_scan_once_excludes_verify_failed(tmp_path) -> None:
     db_path = tmp_path / "ibx_worker_scan.sqlite3"
     init_db(db_path=db_path)
@@ -289,6 +337,46 @@ def test_scan_once_enqueues_task_snapshot(tmp_path) -> None:
             os.environ["IBX_DB_PATH"] = old_db_path
 
 
+def test_expire_overdue_strategies_bulk_expires_and_appends_events(tmp_path) -> None:
+    db_path = tmp_path / "ibx_worker_bulk_expire.sqlite3"
+    init_db(db_path=db_path)
+    _insert_strategy("S-WORKER-BULK-EXPIRED", db_path=db_path, status="ACTIVE")
+    _insert_strategy("S-WORKER-BULK-LIVE", db_path=db_path, status="ACTIVE")
+    with get_connection(db_path) as conn:
+        conn.execute(
+            "UPDATE strategies SET activated_at = ?, logical_activated_at = ? WHERE id = ?",
+            ("2020-01-01T00:00:00Z", "2020-01-01T00:00:00Z", "S-WORKER-BULK-EXPIRED"),
+        )
+        conn.commit()
+
+    engine = StrategyExecutionEngine(enabled=False, monitor_interval_seconds=60, worker_count=1)
+    old_db_path = os.getenv("IBX_DB_PATH")
+    os.environ["IBX_DB_PATH"] = str(db_path)
+    try:
+        assert engine.expire_overdue_strategies() == 1
+        with get_connection(db_path) as conn:
+            statuses = {
+                row["id"]: row["status"]
+                for row in conn.execute("SELECT id, status FROM strategies").fetchall()
+            }
+            events = conn.execute(
+                "SELECT strategy_id, event_type FROM strategy_events"
+            ).fetchall()
+        assert statuses == {
+            "S-WORKER-BULK-EXPIRED": "EXPIRED",
+            "S-WORKER-BULK-LIVE": "ACTIVE",
+        }
+        assert [(row["strategy_id"], row["event_type"]) for row in events] == [
+            ("S-WORKER-BULK-EXPIRED", "EXPIRED")
+        ]
+        assert engine.scan_once() == 1
+    finally:
+        if old_db_path is None:
+            os.environ.pop("IBX_DB_PATH", None)
+        else:
+            os.environ["IBX_DB_PATH"] = old_db_path
+
+
 def test_process_once_skips_when_already_inflight(tmp_path) -> None:
     db_path = tmp_path / "ibx_worker_process_once_inflight.sqlite3"
     init_db(db_path=db_path)
@@ -495,7 +583,7 @@ def test_build_execution_engine_ignores_worker_env_overrides(tmp_path) -> None:
         assert engine._monitor_interval_seconds == 41
         assert engine._max_monitoring_interval_minutes == 66
         assert engine._worker_count == 3
-        assert engine._queue._queue.maxsize == 777
+        assert engine._queue.maxsize() == 777
         assert engine._gateway_not_work_event_throttle_seconds == 601
         assert engine._waiting_for_market_data_event_throttle_seconds == 181
     finally:
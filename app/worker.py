@@ -2,17 +2,20 @@ from __future__ import annotations
 
 import json
 import logging
-import queue
+import os
 import sqlite3
-from dataclasses import dataclass
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from threading import Event, Lock, Thread
+from functools import lru_cache
+from threading import Event, Lock, Semaphore, Thread, local
 from typing import Any, Callable
 from uuid import uuid4
 
 from .chain import sync_order_submitted_strategy_status
 from .config import load_app_config
-from .db import get_connection, init_db
+from .db import EFFECTIVE_EXPIRE_AT_SQL, get_connection, init_db
 from .evaluator import (
     ConditionEvaluationInput,
     ConditionEvaluationState,
@@ -56,6 +59,86 @@ TRADE_TERMINAL_TO_STRATEGY: dict[str, str] = {
 }
 DOWNSTREAM_ACTIVATABLE_STATUSES: set[str] = {"PENDING_ACTIVATION", "VERIFY_FAILED", "PAUSED"}
 
+# Hot-path statements are kept as constants so each connection's statement cache hits.
+_SCAN_SQL = f"""
+SELECT id, status, version
+FROM v_strategies_active
+WHERE status IN ({",".join("?" for _ in SCANNABLE_STATUSES)})
+ORDER BY updated_at ASC, id ASC
+"""
+_SELECT_TASK_SNAPSHOT_SQL = """
+SELECT status, version
+FROM v_strategies_active
+WHERE id = ?
+"""
+_CLAIM_STRATEGY_LOCK_SQL = """
+UPDATE strategies
+SET lock_until = ?
+WHERE id = ?
+  AND status = ?
+  AND version = ?
+  AND is_deleted = 0
+  AND (lock_until IS NULL OR lock_until <= ?)
+"""
+_CLAIM_STRATEGY_LOCK_RETURNING_SQL = (
+    _CLAIM_STRATEGY_LOCK_SQL.rstrip() + f"\nRETURNING *, {EFFECTIVE_EXPIRE_AT_SQL.strip()} AS effective_expire_at\n"
+)
+_SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_EXPIRABLE_STATUS_PARAMS: tuple[str, ...] = tuple(sorted(EXPIRABLE_STATUSES))
+_EXPIRE_OVERDUE_STRATEGIES_SQL = f"""
+UPDATE strategies
+SET status = 'EXPIRED', updated_at = ?, version = version + 1
+WHERE id IN (
+    SELECT id
+    FROM v_strategies_active
+    WHERE status IN ({",".join("?" for _ in _EXPIRABLE_STATUS_PARAMS)})
+      AND effective_expire_at <= ?
+      AND (lock_until IS NULL OR lock_until <= ?)
+)
+RETURNING id
+"""
+_SELECT_LOCKED_STRATEGY_SQL = """
+SELECT *
+FROM v_strategies_active
+WHERE id = ? AND lock_until = ?
+"""
+_RELEASE_STRATEGY_LOCK_SQL = """
+UPDATE strategies
+SET lock_until = NULL
+WHERE id = ? AND lock_until = ? AND is_deleted = 0
+"""
+_EXPIRE_STRATEGY_SQL = """
+UPDATE strategies
+SET status = 'EXPIRED', updated_at = ?, version = version + 1
+WHERE id = ? AND status = ? AND is_deleted = 0
+"""
+_INSERT_STRATEGY_EVENT_SQL = """
+INSERT INTO strategy_events (strategy_id, timestamp, event_type, detail)
+VALUES (?, ?, ?, ?)
+"""
+_ACTIVE_RUNTIME_STATE_KEYS: tuple[str, ...] = (
+    RUNTIME_KEY_LAST_EVALUATION_OUTCOME,
+    RUNTIME_KEY_GATEWAY_NOT_WORK_EVENT_TS,
+    RUNTIME_KEY_WAITING_FOR_MARKET_DATA_EVENT_TS,
+)
+_SELECT_RUNTIME_STATES_SQL = f"""
+SELECT state_key, state_value
+FROM strategy_runtime_states
+WHERE strategy_id = ? AND state_key IN ({",".join("?" for _ in _ACTIVE_RUNTIME_STATE_KEYS)})
+"""
+_UPSERT_RUNTIME_STATE_SQL = """
+INSERT INTO strategy_runtime_states (strategy_id, state_key, state_value, updated_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(strategy_id, state_key) DO UPDATE SET
+    state_value = excluded.state_value,
+    updated_at = excluded.updated_at
+"""
+_ACTIVE_TO_VERIFY_FAILED_SQL = """
+UPDATE strategies
+SET status = 'VERIFY_FAILED', updated_at = ?, version = version + 1
+WHERE id = ? AND status = 'ACTIVE' AND is_deleted = 0
+"""
+
 
 def _utcnow() -> datetime:
     return datetime.now(UTC)
@@ -67,6 +150,8 @@ def _to_utc(dt: datetime) -> datetime:
     return dt.astimezone(UTC)
 
 
+# Handlers format the same task-scoped `now` many times; memoize the conversion.
+@lru_cache(maxsize=1024)
 def _to_iso_utc(dt: datetime) -> str:
     return _to_utc(dt).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
@@ -74,7 +159,12 @@ def _to_iso_utc(dt: datetime) -> str:
 def _parse_iso_utc(value: str | None) -> datetime | None:
     if not value:
         return None
-    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(UTC)
+    # Python 3.11+ fromisoformat accepts the trailing `Z` and returns the timezone.utc singleton,
+    # so canonical values written by _to_iso_utc skip both the str.replace and astimezone.
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is UTC:
+        return parsed
+    return parsed.astimezone(UTC)
 
 
 def _to_int_or_none(value: Any) -> int | None:
@@ -283,60 +373,144 @@ def _build_worker_order_service() -> IBOrderService:
 class StrategyTask:
     strategy_id: str
     reason: str
-    expected_status: str
-    expected_version: int
+    # None means "no snapshot yet": the worker reads status/version right before claiming.
+    expected_status: str | None
+    expected_version: int | None
     enqueued_at: datetime
 
 
+@dataclass
+class _TaskWriteBuffer:
+    # Event inserts and runtime-state upserts collected during one task, flushed before commit.
+    events: list[tuple[str, str, str, str]] = field(default_factory=list)
+    runtime_states: list[tuple[str, str, str | None, str]] = field(default_factory=list)
+
+
+class _TaskShard:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.tasks: deque[StrategyTask] = deque()
+        self.inflight: set[str] = set()
+
+
 class StrategyTaskQueue:
-    def __init__(self, *, maxsize: int) -> None:
-        self._queue: queue.Queue[StrategyTask] = queue.Queue(maxsize=maxsize)
-        self._inflight: set[str] = set()
-        self._lock = Lock()
+    # One shard per worker, picked by strategy_id so a strategy always lands on the same shard
+    # (and its inflight set). Owners pop from the head; idle workers steal from other tails.
+    def __init__(self, *, maxsize: int, shards: int = 1) -> None:
+        self._maxsize = max(1, int(maxsize))
+        self._shards = [_TaskShard() for _ in range(max(1, int(shards)))]
+        self._slots = Semaphore(self._maxsize)
+        # Permits = queued tasks + pending wakeups; wake() adds permits that carry no task.
+        self._available = Semaphore(0)
+        self._wake_lock = Lock()
+        self._wakeups = 0
+
+    def _shard_for(self, strategy_id: str) -> _TaskShard:
+        return self._shards[hash(strategy_id) % len(self._shards)]
 
     def enqueue(self, task: StrategyTask) -> bool:
         if not self.claim(task.strategy_id):
             return False
-        try:
-            self._queue.put_nowait(task)
-        except queue.Full:
-            self.release(task.strategy_id)
+        return self.enqueue_prebuilt(task)
+
+    def enqueue_prebuilt(self, task: StrategyTask) -> bool:
+        # Caller must already hold the inflight claim for task.strategy_id.
+        shard = self._shard_for(task.strategy_id)
+        if not self._slots.acquire(blocking=False):
+            with shard.lock:
+                shard.inflight.discard(task.strategy_id)
             return False
+        with shard.lock:
+            shard.tasks.append(task)
+        self._available.release()
         return True
 
-    def pop(self, timeout: float) -> StrategyTask | None:
-        try:
-            return self._queue.get(timeout=timeout)
-        except queue.Empty:
+    def pop(self, timeout: float | None = None, *, shard_index: int = 0) -> StrategyTask | None:
+        if not self._available.acquire(timeout=timeout):
             return None
+        count = len(self._shards)
+        own = shard_index % count
+        # Holding a permit guarantees a task or a wakeup exists; a pass can only miss the task
+        # when a concurrent thief races us, so keep scanning until one of them is found.
+        while True:
+            shard = self._shards[own]
+            with shard.lock:
+                if shard.tasks:
+                    task = shard.tasks.popleft()
+                    break
+            task = self._steal(own)
+            if task is not None:
+                break
+            with self._wake_lock:
+                if self._wakeups > 0:
+                    self._wakeups -= 1
+                    return None
+        self._slots.release()
+        return task
+
+    def wake(self, count: int) -> None:
+        if count <= 0:
+            return
+        with self._wake_lock:
+            self._wakeups += count
+        self._available.release(count)
+
+    def _steal(self, own: int) -> StrategyTask | None:
+        count = len(self._shards)
+        for offset in range(1, count):
+            victim = self._shards[(own + offset) % count]
+            with victim.lock:
+                if victim.tasks:
+                    return victim.tasks.pop()
+        return None
 
     def mark_done(self, strategy_id: str) -> None:
         self.release(strategy_id)
-        self._queue.task_done()
 
     def claim(self, strategy_id: str) -> bool:
-        with self._lock:
-            if strategy_id in self._inflight:
+        shard = self._shard_for(strategy_id)
+        with shard.lock:
+            if strategy_id in shard.inflight:
                 return False
-            self._inflight.add(strategy_id)
+            shard.inflight.add(strategy_id)
             return True
 
+    def claim_many(self, strategy_ids: list[str]) -> set[str]:
+        by_shard: dict[int, list[str]] = {}
+        count = len(self._shards)
+        for strategy_id in strategy_ids:
+            by_shard.setdefault(hash(strategy_id) % count, []).append(strategy_id)
+        accepted: set[str] = set()
+        for shard_idx, shard_ids in by_shard.items():
+            shard = self._shards[shard_idx]
+            with shard.lock:
+                for strategy_id in shard_ids:
+                    if strategy_id in shard.inflight:
+                        continue
+                    shard.inflight.add(strategy_id)
+                    accepted.add(strategy_id)
+        return accepted
+
     def release(self, strategy_id: str) -> None:
-        with self._lock:
-            self._inflight.discard(strategy_id)
+        shard = self._shard_for(strategy_id)
+        with shard.lock:
+            shard.inflight.discard(strategy_id)
 
     def qsize(self) -> int:
-        return int(self._queue.qsize())
+        return sum(len(shard.tasks) for shard in self._shards)
 
     def maxsize(self) -> int:
-        return int(self._queue.maxsize)
+        return self._maxsize
+
+    def shard_count(self) -> int:
+        return len(self._shards)
 
     def inflight_count(self) -> int:
-        with self._lock:
-            return len(self._inflight)
+        return sum(len(shard.inflight) for shard in self._shards)
 
 
 StrategyHandler = Callable[[sqlite3.Connection, sqlite3.Row, datetime], None]
+ActiveOutcomeHandler = Callable[..., None]
 
 
 class StrategyExecutionEngine:
@@ -351,6 +525,7 @@ class StrategyExecutionEngine:
         gateway_not_work_event_throttle_seconds: int = 300,
         waiting_for_market_data_event_throttle_seconds: int = 120,
         strategy_lock_ttl_seconds: int = DEFAULT_STRATEGY_LOCK_TTL_SECONDS,
+        pin_to_cpu: bool = False,
         market_data_provider: MarketDataProvider | None = None,
         order_service: IBOrderService | None = None,
     ) -> None:
@@ -359,12 +534,13 @@ class StrategyExecutionEngine:
         self._monitor_interval_seconds = monitor_interval_seconds
         self._max_monitoring_interval_minutes = max(1, int(max_monitoring_interval_minutes))
         self._worker_count = worker_count
-        self._queue = StrategyTaskQueue(maxsize=queue_maxsize)
+        self._queue = StrategyTaskQueue(maxsize=queue_maxsize, shards=worker_count)
         self._gateway_not_work_event_throttle_seconds = gateway_not_work_event_throttle_seconds
         self._waiting_for_market_data_event_throttle_seconds = (
             waiting_for_market_data_event_throttle_seconds
         )
         self._strategy_lock_ttl_seconds = max(1, int(strategy_lock_ttl_seconds))
+        self._pin_to_cpu = bool(pin_to_cpu)
         self._market_data_provider = market_data_provider
         self._order_service = order_service or _build_worker_order_service()
         self._stop_event = Event()
@@ -373,7 +549,14 @@ class StrategyExecutionEngine:
         self._scanner_thread: Thread | None = None
         self._worker_threads: list[Thread] = []
         self._handlers: dict[str, StrategyHandler] = {}
+        self._task_local = local()
         self._register_default_handlers()
+        self._active_outcome_handlers: dict[str, ActiveOutcomeHandler] = {
+            "condition_config_invalid": self._on_active_condition_config_invalid,
+            "gateway_not_work": self._on_active_gateway_not_work,
+            "waiting_for_market_data": self._on_active_waiting_for_market_data,
+            "evaluated": self._on_active_evaluated,
+        }
 
     @property
     def enabled(self) -> bool:
@@ -462,6 +645,7 @@ class StrategyExecutionEngine:
             self._stop_event.set()
             scanner = self._scanner_thread
             workers = list(self._worker_threads)
+            self._queue.wake(len(workers))
             self._scanner_thread = None
             self._worker_threads = []
             self._running = False
@@ -472,20 +656,6 @@ class StrategyExecutionEngine:
             worker.join(timeout=timeout_seconds)
         self._logger.info("strategy execution engine stopped")
 
-    def _load_task_snapshot(self, strategy_id: str) -> tuple[str, int] | None:
-        with get_connection() as conn:
-            row = conn.execute(
-                """
-                SELECT status, version
-                FROM v_strategies_active
-                WHERE id = ?
-                """,
-                (strategy_id,),
-            ).fetchone()
-        if row is None:
-            return None
-        return str(row["status"]), int(row["version"])
-
     def enqueue_strategy(
         self,
         strategy_id: str,
@@ -494,11 +664,9 @@ class StrategyExecutionEngine:
         expected_status: str | None = None,
         expected_version: int | None = None,
     ) -> bool:
+        # A partial snapshot is dropped; the worker reads both fields right before claiming.
         if expected_status is None or expected_version is None:
-            snapshot = self._load_task_snapshot(strategy_id)
-            if snapshot is None:
-                return False
-            expected_status, expected_version = snapshot
+            expected_status, expected_version = None, None
         task = StrategyTask(
             strategy_id=strategy_id,
             reason=reason,
@@ -507,47 +675,66 @@ class StrategyExecutionEngine:
             enqueued_at=_utcnow(),
         )
         accepted = self._queue.enqueue(task)
-        if not accepted:
+        if not accepted and self._logger.isEnabledFor(logging.DEBUG):
             self._logger.debug("skip enqueue strategy_id=%s reason=%s", strategy_id, reason)
         return accepted
 
     def scan_once(self) -> int:
-        placeholders = ",".join("?" for _ in SCANNABLE_STATUSES)
         with get_connection() as conn:
-            rows = conn.execute(
-                f"""
-                SELECT id, status, version
-                FROM v_strategies_active
-                WHERE status IN ({placeholders})
-                ORDER BY updated_at ASC, id ASC
-                """,
-                SCANNABLE_STATUSES,
-            ).fetchall()
-        enqueued = 0
-        for row in rows:
-            if self.enqueue_strategy(
-                row["id"],
+            rows = conn.execute(_SCAN_SQL, SCANNABLE_STATUSES).fetchall()
+        enqueued_at = _utcnow()
+        tasks = [
+            StrategyTask(
+                strategy_id=str(row["id"]),
                 reason="periodic_scan",
                 expected_status=str(row["status"]),
                 expected_version=int(row["version"]),
-            ):
+                enqueued_at=enqueued_at,
+            )
+            for row in rows
+        ]
+        accepted = self._queue.claim_many([task.strategy_id for task in tasks])
+        debug_enabled = self._logger.isEnabledFor(logging.DEBUG)
+        enqueued = 0
+        for task in tasks:
+            if task.strategy_id not in accepted:
+                if debug_enabled:
+                    self._logger.debug("skip enqueue strategy_id=%s reason=%s", task.strategy_id, task.reason)
+                continue
+            if self._queue.enqueue_prebuilt(task):
                 enqueued += 1
         return enqueued
 
+    def expire_overdue_strategies(self) -> int:
+        # Per-task expiry in _process_task stays as the fallback for old SQLite and for
+        # strategies that were locked by a worker during the sweep.
+        if not _SQLITE_SUPPORTS_RETURNING:
+            return 0
+        now = _utcnow()
+        now_iso = _to_iso_utc(now)
+        with get_connection() as conn:
+            rows = conn.execute(
+                _EXPIRE_OVERDUE_STRATEGIES_SQL,
+                (now_iso, *_EXPIRABLE_STATUS_PARAMS, now_iso, now_iso),
+            ).fetchall()
+            conn.executemany(
+                _INSERT_STRATEGY_EVENT_SQL,
+                [(row["id"], now_iso, "EXPIRED", "策略到期，已终止执行") for row in rows],
+            )
+            conn.commit()
+        return len(rows)
+
     def process_once(self, strategy_id: str, *, reason: str = "manual") -> None:
         if not self._queue.claim(strategy_id):
-            self._logger.debug("skip process_once strategy_id=%s reason=%s (already inflight)", strategy_id, reason)
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("skip process_once strategy_id=%s reason=%s (already inflight)", strategy_id, reason)
             return
         try:
-            snapshot = self._load_task_snapshot(strategy_id)
-            if snapshot is None:
-                return
-            expected_status, expected_version = snapshot
             task = StrategyTask(
                 strategy_id=strategy_id,
                 reason=reason,
-                expected_status=expected_status,
-                expected_version=expected_version,
+                expected_status=None,
+                expected_version=None,
                 enqueued_at=_utcnow(),
             )
             self._process_task(task)
@@ -567,19 +754,42 @@ class StrategyExecutionEngine:
     def _scan_loop(self) -> None:
         self._logger.info("scanner loop started")
         while not self._stop_event.is_set():
+            cycle_started = time.monotonic()
             try:
+                expired = self.expire_overdue_strategies()
+                if expired > 0:
+                    self._logger.info("scanner expired strategies count=%s", expired)
                 enqueued = self.scan_once()
-                self._logger.debug("scanner enqueued=%s", enqueued)
+                if self._logger.isEnabledFor(logging.DEBUG):
+                    self._logger.debug("scanner enqueued=%s", enqueued)
             except Exception:
                 self._logger.exception("scanner loop failed")
-            if self._stop_event.wait(timeout=float(self._monitor_interval_seconds)):
+            remaining = float(self._monitor_interval_seconds) - (time.monotonic() - cycle_started)
+            if self._stop_event.wait(timeout=max(0.0, remaining)):
                 break
         self._logger.info("scanner loop stopped")
 
+    def _pin_worker_thread(self, worker_index: int) -> None:
+        # On Linux, pid 0 targets the calling thread, keeping its SQLite connection cache on one core.
+        sched_setaffinity = getattr(os, "sched_setaffinity", None)
+        if sched_setaffinity is None:
+            return
+        # Choose from the CPUs this thread may run on (taskset / cgroup cpuset), not 0..cpu_count-1.
+        allowed = sorted(os.sched_getaffinity(0))
+        if not allowed:
+            return
+        cpu = allowed[(worker_index - 1) % len(allowed)]
+        try:
+            sched_setaffinity(0, {cpu})
+        except OSError as exc:
+            self._logger.warning("worker cpu pinning failed worker=%s cpu=%s error=%s", worker_index, cpu, exc)
+
     def _worker_loop(self, worker_index: int) -> None:
         self._logger.info("worker loop started worker=%s", worker_index)
+        if self._pin_to_cpu:
+            self._pin_worker_thread(worker_index)
         while not self._stop_event.is_set():
-            task = self._queue.pop(timeout=0.5)
+            task = self._queue.pop(shard_index=worker_index - 1)
             if task is None:
                 continue
             try:
@@ -595,123 +805,109 @@ class StrategyExecutionEngine:
     def _process_task(self, task: StrategyTask) -> None:
         now = _utcnow()
         lock_until_iso: str | None = None
+        claimed_row: sqlite3.Row | None = None
+        now_iso = _to_iso_utc(now)
         with get_connection() as conn:
+            expected_status = task.expected_status
+            expected_version = task.expected_version
+            if expected_status is None or expected_version is None:
+                snapshot = conn.execute(_SELECT_TASK_SNAPSHOT_SQL, (task.strategy_id,)).fetchone()
+                if snapshot is None:
+                    return
+                expected_status, expected_version = str(snapshot["status"]), int(snapshot["version"])
             lock_until = _to_utc(now + timedelta(seconds=self._strategy_lock_ttl_seconds))
             lock_until_iso = _to_iso_utc(lock_until)
-            cursor = conn.execute(
-                """
-                UPDATE strategies
-                SET lock_until = ?
-                WHERE id = ?
-                  AND status = ?
-                  AND version = ?
-                  AND is_deleted = 0
-                  AND (lock_until IS NULL OR lock_until <= ?)
-                """,
-                (
-                    lock_until_iso,
-                    task.strategy_id,
-                    task.expected_status,
-                    task.expected_version,
-                    _to_iso_utc(now),
-                ),
+            claim_params = (
+                lock_until_iso,
+                task.strategy_id,
+                expected_status,
+                expected_version,
+                now_iso,
             )
-            if cursor.rowcount <= 0:
-                self._logger.debug(
-                    "skip task strategy_id=%s reason=%s (snapshot changed status/version)",
-                    task.strategy_id,
-                    task.reason,
-                )
+            if _SQLITE_SUPPORTS_RETURNING:
+                claimed_row = conn.execute(_CLAIM_STRATEGY_LOCK_RETURNING_SQL, claim_params).fetchone()
+                claimed = claimed_row is not None
+            else:
+                claimed = conn.execute(_CLAIM_STRATEGY_LOCK_SQL, claim_params).rowcount > 0
+            if not claimed:
+                if self._logger.isEnabledFor(logging.DEBUG):
+                    self._logger.debug(
+                        "skip task strategy_id=%s reason=%s (snapshot changed status/version)",
+                        task.strategy_id,
+                        task.reason,
+                    )
                 return
             conn.commit()
 
+        write_buffer = _TaskWriteBuffer()
+        self._task_local.write_buffer = write_buffer
         try:
-            now = _utcnow()
             with get_connection() as conn:
-                row = conn.execute(
-                    """
-                    SELECT *
-                    FROM v_strategies_active
-                    WHERE id = ? AND lock_until = ?
-                    """,
-                    (task.strategy_id, lock_until_iso),
-                ).fetchone()
+                row = claimed_row
+                if row is None:
+                    row = conn.execute(
+                        _SELECT_LOCKED_STRATEGY_SQL,
+                        (task.strategy_id, lock_until_iso),
+                    ).fetchone()
                 if row is None:
                     return
                 status = str(row["status"])
                 if status in TERMINAL_STATUSES:
                     return
 
-                if self._expire_if_needed(conn, strategy_row=row, now=now):
+                if self._expire_if_needed(conn, strategy_row=row, status=status, now=now):
+                    self._flush_task_writes(conn, write_buffer)
                     conn.commit()
                     return
 
                 latest = conn.execute(
-                    """
-                    SELECT *
-                    FROM v_strategies_active
-                    WHERE id = ? AND lock_until = ?
-                    """,
+                    _SELECT_LOCKED_STRATEGY_SQL,
                     (task.strategy_id, lock_until_iso),
                 ).fetchone()
                 if latest is None:
                     return
                 handler = self._handlers.get(str(latest["status"]), self._handle_noop)
                 handler(conn, latest, now)
+                self._flush_task_writes(conn, write_buffer)
                 conn.commit()
         finally:
+            self._task_local.write_buffer = None
             if lock_until_iso is not None:
                 with get_connection() as conn:
                     conn.execute(
-                        """
-                        UPDATE strategies
-                        SET lock_until = NULL
-                        WHERE id = ? AND lock_until = ? AND is_deleted = 0
-                        """,
+                        _RELEASE_STRATEGY_LOCK_SQL,
                         (task.strategy_id, lock_until_iso),
                     )
                     conn.commit()
 
-    def _effective_expire_at(self, strategy_row: sqlite3.Row) -> datetime | None:
-        explicit = _parse_iso_utc(strategy_row["expire_at"])
-        if explicit is not None:
-            return explicit
-
-        if strategy_row["expire_mode"] != "relative":
-            return None
-        if not strategy_row["expire_in_seconds"]:
-            return None
-
-        base = _parse_iso_utc(strategy_row["logical_activated_at"]) or _parse_iso_utc(
-            strategy_row["activated_at"]
-        )
-        if base is None:
-            return None
-        return base + timedelta(seconds=int(strategy_row["expire_in_seconds"]))
-
-    def _expire_if_needed(self, conn: sqlite3.Connection, *, strategy_row: sqlite3.Row, now: datetime) -> bool:
-        status = str(strategy_row["status"])
+    def _expire_if_needed(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        strategy_row: sqlite3.Row,
+        status: str,
+        now: datetime,
+    ) -> bool:
         if status not in EXPIRABLE_STATUSES:
             return False
-        expire_at = self._effective_expire_at(strategy_row)
-        if expire_at is None or now < expire_at:
+        strategy_id = strategy_row["id"]
+        # v_strategies_active (and the claim RETURNING clause) compute this in canonical ISO form,
+        # so a plain string comparison avoids parsing timestamps for strategies nowhere near expiry.
+        effective_expire_at = strategy_row["effective_expire_at"]
+        now_iso = _to_iso_utc(now)
+        if effective_expire_at is None or effective_expire_at > now_iso:
             return False
 
-        now_iso = _to_iso_utc(now)
         cursor = conn.execute(
-            """
-            UPDATE strategies
-            SET status = 'EXPIRED', updated_at = ?, version = version + 1
-            WHERE id = ? AND status = ? AND is_deleted = 0
-            """,
-            (now_iso, strategy_row["id"], status),
+            _EXPIRE_STRATEGY_SQL,
+            (now_iso, strategy_id, status),
         )
         if cursor.rowcount <= 0:
             return False
 
         self._append_event(
             conn,
-            strategy_id=strategy_row["id"],
+            strategy_id=strategy_id,
             event_type="EXPIRED",
             detail="策略到期，已终止执行",
             ts=now,
@@ -727,33 +923,35 @@ class StrategyExecutionEngine:
         detail: str,
         ts: datetime,
     ) -> None:
-        conn.execute(
-            """
-            INSERT INTO strategy_events (strategy_id, timestamp, event_type, detail)
-            VALUES (?, ?, ?, ?)
-            """,
-            (strategy_id, _to_iso_utc(ts), event_type, detail),
-        )
+        params = (strategy_id, _to_iso_utc(ts), event_type, detail)
+        write_buffer: _TaskWriteBuffer | None = getattr(self._task_local, "write_buffer", None)
+        if write_buffer is not None:
+            write_buffer.events.append(params)
+            return
+        conn.execute(_INSERT_STRATEGY_EVENT_SQL, params)
 
-    def _get_runtime_state(
+    def _flush_task_writes(self, conn: sqlite3.Connection, write_buffer: _TaskWriteBuffer) -> None:
+        if write_buffer.events:
+            conn.executemany(_INSERT_STRATEGY_EVENT_SQL, write_buffer.events)
+            write_buffer.events.clear()
+        if write_buffer.runtime_states:
+            conn.executemany(_UPSERT_RUNTIME_STATE_SQL, write_buffer.runtime_states)
+            write_buffer.runtime_states.clear()
+
+    def _load_runtime_states(
         self,
         conn: sqlite3.Connection,
         *,
         strategy_id: str,
-        state_key: str,
-    ) -> str | None:
-        row = conn.execute(
-            """
-            SELECT state_value
-            FROM strategy_runtime_states
-            WHERE strategy_id = ? AND state_key = ?
-            """,
-            (strategy_id, state_key),
-        ).fetchone()
-        if row is None:
-            return None
-        value = row["state_value"]
-        return None if value is None else str(value)
+    ) -> dict[str, str | None]:
+        rows = conn.execute(
+            _SELECT_RUNTIME_STATES_SQL,
+            (strategy_id, *_ACTIVE_RUNTIME_STATE_KEYS),
+        ).fetchall()
+        return {
+            str(row["state_key"]): None if row["state_value"] is None else str(row["state_value"])
+            for row in rows
+        }
 
     def _set_runtime_state(
         self,
@@ -764,32 +962,20 @@ class StrategyExecutionEngine:
         state_value: str | None,
         now: datetime,
     ) -> None:
-        now_iso = _to_iso_utc(now)
-        conn.execute(
-            """
-            INSERT INTO strategy_runtime_states (strategy_id, state_key, state_value, updated_at)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(strategy_id, state_key) DO UPDATE SET
-                state_value = excluded.state_value,
-                updated_at = excluded.updated_at
-            """,
-            (strategy_id, state_key, state_value, now_iso),
-        )
+        params = (strategy_id, state_key, state_value, _to_iso_utc(now))
+        write_buffer: _TaskWriteBuffer | None = getattr(self._task_local, "write_buffer", None)
+        if write_buffer is not None:
+            write_buffer.runtime_states.append(params)
+            return
+        conn.execute(_UPSERT_RUNTIME_STATE_SQL, params)
 
     def _should_emit_throttled_event(
         self,
-        conn: sqlite3.Connection,
         *,
-        strategy_id: str,
-        event_state_key: str,
+        last_emitted_raw: str | None,
         now: datetime,
         throttle_seconds: int,
     ) -> bool:
-        last_emitted_raw = self._get_runtime_state(
-            conn,
-            strategy_id=strategy_id,
-            state_key=event_state_key,
-        )
         if last_emitted_raw is None:
             return True
         last_emitted_at = _parse_iso_utc(last_emitted_raw)
@@ -1160,14 +1346,15 @@ class StrategyExecutionEngine:
                         fetch_result = provider.get_historical_bars(request)
                         bars = list(fetch_result.bars)
                     except Exception as exc:  # noqa: BLE001
-                        self._logger.debug(
-                            "market data fetch failed strategy_id=%s condition_id=%s contract_id=%s payload=%s error=%s",
-                            strategy_id,
-                            prepared.condition_id or f"c{idx}",
-                            contract_id,
-                            payload,
-                            exc,
-                        )
+                        if self._logger.isEnabledFor(logging.DEBUG):
+                            self._logger.debug(
+                                "market data fetch failed strategy_id=%s condition_id=%s contract_id=%s payload=%s error=%s",
+                                strategy_id,
+                                prepared.condition_id or f"c{idx}",
+                                contract_id,
+                                payload,
+                                exc,
+                            )
                         contract_summary["status"] = "fetch_failed"
                         contract_summary["error"] = type(exc).__name__
                         bars = []
@@ -1530,26 +1717,18 @@ class StrategyExecutionEngine:
 
     def _handle_active(self, conn: sqlite3.Connection, strategy_row: sqlite3.Row, now: datetime) -> None:
         strategy_id = strategy_row["id"]
+        now_iso = _to_iso_utc(now)
         initial_last_monitoring_data_end_at = self._resolve_initial_last_monitoring_data_end_at(
             strategy_row=strategy_row,
         )
         if initial_last_monitoring_data_end_at is None:
-            cursor = conn.execute(
-                """
-                UPDATE strategies
-                SET status = 'VERIFY_FAILED', updated_at = ?, version = version + 1
-                WHERE id = ? AND status = 'ACTIVE' AND is_deleted = 0
-                """,
-                (_to_iso_utc(now), strategy_id),
+            self._fail_active_verification(
+                conn,
+                strategy_id=strategy_id,
+                detail="ACTIVE 阶段评估失败：missing_activation_time",
+                now=now,
+                now_iso=now_iso,
             )
-            if cursor.rowcount > 0:
-                self._append_event(
-                    conn,
-                    strategy_id=strategy_id,
-                    event_type="VERIFY_FAILED",
-                    detail="ACTIVE 阶段评估失败：missing_activation_time",
-                    ts=now,
-                )
             return
         if self._market_data_provider is None:
             raise RuntimeError("ACTIVE stage missing market data provider")
@@ -1568,7 +1747,7 @@ class StrategyExecutionEngine:
             self._logger.info(
                 "skip active monitoring strategy_id=%s now=%s suggested_next_monitor_at=%s updated_at=%s max_interval_minutes=%s",
                 strategy_id,
-                _to_iso_utc(now),
+                now_iso,
                 _to_iso_utc(previous_suggested_next_monitor_at) if previous_suggested_next_monitor_at else None,
                 _to_iso_utc(previous_updated_at) if previous_updated_at else None,
                 self._max_monitoring_interval_minutes,
@@ -1589,22 +1768,13 @@ class StrategyExecutionEngine:
             now=now,
         )
         if not has_data_requirements:
-            cursor = conn.execute(
-                """
-                UPDATE strategies
-                SET status = 'VERIFY_FAILED', updated_at = ?, version = version + 1
-                WHERE id = ? AND status = 'ACTIVE' AND is_deleted = 0
-                """,
-                (_to_iso_utc(now), strategy_id),
+            self._fail_active_verification(
+                conn,
+                strategy_id=strategy_id,
+                detail="ACTIVE 阶段评估失败：missing_data_requirements",
+                now=now,
+                now_iso=now_iso,
             )
-            if cursor.rowcount > 0:
-                self._append_event(
-                    conn,
-                    strategy_id=strategy_id,
-                    event_type="VERIFY_FAILED",
-                    detail="ACTIVE 阶段评估失败：missing_data_requirements",
-                    ts=now,
-                )
             return
         evaluated_at_for_store: datetime | None = _utcnow() if has_condition_evaluated else None
         self._logger.info(
@@ -1645,11 +1815,7 @@ class StrategyExecutionEngine:
                     ),
                     ts=now,
                 )
-        previous_outcome = self._get_runtime_state(
-            conn,
-            strategy_id=strategy_id,
-            state_key=RUNTIME_KEY_LAST_EVALUATION_OUTCOME,
-        )
+        runtime_states = self._load_runtime_states(conn, strategy_id=strategy_id)
         self._set_runtime_state(
             conn,
             strategy_id=strategy_id,
@@ -1657,88 +1823,164 @@ class StrategyExecutionEngine:
             state_value=result.outcome,
             now=now,
         )
-        if result.outcome == "condition_config_invalid":
-            cursor = conn.execute(
-                """
-                UPDATE strategies
-                SET status = 'VERIFY_FAILED', updated_at = ?, version = version + 1
-                WHERE id = ? AND status = 'ACTIVE' AND is_deleted = 0
-                """,
-                (_to_iso_utc(now), strategy_id),
-            )
-            if cursor.rowcount > 0:
-                error_detail = str(result.metrics.get("error") or "").strip()
-                detail = "ACTIVE 阶段评估失败：condition_config_invalid"
-                if error_detail:
-                    detail = f"{detail}: {error_detail}"
-                self._append_event(
-                    conn,
-                    strategy_id=strategy_id,
-                    event_type="VERIFY_FAILED",
-                    detail=detail,
-                    ts=now,
-                )
-            return
-        if result.outcome == "gateway_not_work":
-            should_emit = previous_outcome != "gateway_not_work" or self._should_emit_throttled_event(
-                conn,
-                strategy_id=strategy_id,
-                event_state_key=RUNTIME_KEY_GATEWAY_NOT_WORK_EVENT_TS,
-                now=now,
-                throttle_seconds=self._gateway_not_work_event_throttle_seconds,
-            )
-            if should_emit:
-                self._append_event(
-                    conn,
-                    strategy_id=strategy_id,
-                    event_type="GATEWAY_NOT_WORK",
-                    detail="网关不可用，跳过本轮评估",
-                    ts=now,
-                )
-                self._set_runtime_state(
-                    conn,
-                    strategy_id=strategy_id,
-                    state_key=RUNTIME_KEY_GATEWAY_NOT_WORK_EVENT_TS,
-                    state_value=_to_iso_utc(now),
-                    now=now,
-                )
+        outcome_handler = self._active_outcome_handlers.get(result.outcome)
+        if outcome_handler is None:
             return
-        if result.outcome == "waiting_for_market_data":
-            should_emit = previous_outcome != "waiting_for_market_data" or self._should_emit_throttled_event(
+        outcome_handler(
+            conn,
+            strategy_id=strategy_id,
+            result=result,
+            runtime_states=runtime_states,
+            now=now,
+            now_iso=now_iso,
+        )
+
+    def _fail_active_verification(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        strategy_id: str,
+        detail: str,
+        now: datetime,
+        now_iso: str,
+    ) -> None:
+        cursor = conn.execute(
+            _ACTIVE_TO_VERIFY_FAILED_SQL,
+            (now_iso, strategy_id),
+        )
+        if cursor.rowcount > 0:
+            self._append_event(
                 conn,
                 strategy_id=strategy_id,
-                event_state_key=RUNTIME_KEY_WAITING_FOR_MARKET_DATA_EVENT_TS,
-                now=now,
-                throttle_seconds=self._waiting_for_market_data_event_throttle_seconds,
+                event_type="VERIFY_FAILED",
+                detail=detail,
+                ts=now,
             )
-            if should_emit:
-                self._append_event(
-                    conn,
-                    strategy_id=strategy_id,
-                    event_type="WAITING_FOR_MARKET_DATA",
-                    detail="行情数据未就绪，跳过本轮评估",
-                    ts=now,
-                )
-                self._set_runtime_state(
-                    conn,
-                    strategy_id=strategy_id,
-                    state_key=RUNTIME_KEY_WAITING_FOR_MARKET_DATA_EVENT_TS,
-                    state_value=_to_iso_utc(now),
-                    now=now,
-                )
-            return
-        if result.outcome != "evaluated":
+
+    def _on_active_condition_config_invalid(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        strategy_id: str,
+        result: StrategyEvaluationResult,
+        runtime_states: dict[str, str | None],
+        now: datetime,
+        now_iso: str,
+    ) -> None:
+        detail = "ACTIVE 阶段评估失败：condition_config_invalid"
+        error_detail = str(result.metrics.get("error") or "").strip()
+        if error_detail:
+            detail = f"{detail}: {error_detail}"
+        self._fail_active_verification(
+            conn,
+            strategy_id=strategy_id,
+            detail=detail,
+            now=now,
+            now_iso=now_iso,
+        )
+
+    def _on_active_gateway_not_work(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        strategy_id: str,
+        result: StrategyEvaluationResult,
+        runtime_states: dict[str, str | None],
+        now: datetime,
+        now_iso: str,
+    ) -> None:
+        self._emit_throttled_active_event(
+            conn,
+            strategy_id=strategy_id,
+            outcome=result.outcome,
+            runtime_states=runtime_states,
+            event_state_key=RUNTIME_KEY_GATEWAY_NOT_WORK_EVENT_TS,
+            throttle_seconds=self._gateway_not_work_event_throttle_seconds,
+            event_type="GATEWAY_NOT_WORK",
+            detail="网关不可用，跳过本轮评估",
+            now=now,
+            now_iso=now_iso,
+        )
+
+    def _on_active_waiting_for_market_data(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        strategy_id: str,
+        result: StrategyEvaluationResult,
+        runtime_states: dict[str, str | None],
+        now: datetime,
+        now_iso: str,
+    ) -> None:
+        self._emit_throttled_active_event(
+            conn,
+            strategy_id=strategy_id,
+            outcome=result.outcome,
+            runtime_states=runtime_states,
+            event_state_key=RUNTIME_KEY_WAITING_FOR_MARKET_DATA_EVENT_TS,
+            throttle_seconds=self._waiting_for_market_data_event_throttle_seconds,
+            event_type="WAITING_FOR_MARKET_DATA",
+            detail="行情数据未就绪，跳过本轮评估",
+            now=now,
+            now_iso=now_iso,
+        )
+
+    def _emit_throttled_active_event(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        strategy_id: str,
+        outcome: str,
+        runtime_states: dict[str, str | None],
+        event_state_key: str,
+        throttle_seconds: int,
+        event_type: str,
+        detail: str,
+        now: datetime,
+        now_iso: str,
+    ) -> None:
+        previous_outcome = runtime_states.get(RUNTIME_KEY_LAST_EVALUATION_OUTCOME)
+        should_emit = previous_outcome != outcome or self._should_emit_throttled_event(
+            last_emitted_raw=runtime_states.get(event_state_key),
+            now=now,
+            throttle_seconds=throttle_seconds,
+        )
+        if not should_emit:
             return
+        self._append_event(
+            conn,
+            strategy_id=strategy_id,
+            event_type=event_type,
+            detail=detail,
+            ts=now,
+        )
+        self._set_runtime_state(
+            conn,
+            strategy_id=strategy_id,
+            state_key=event_state_key,
+            state_value=now_iso,
+            now=now,
+        )
+
+    def _on_active_evaluated(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        strategy_id: str,
+        result: StrategyEvaluationResult,
+        runtime_states: dict[str, str | None],
+        now: datetime,
+        now_iso: str,
+    ) -> None:
         if not result.condition_met:
             return
-
         cursor = conn.execute(
             """
             UPDATE strategies
             SET status = 'TRIGGERED', updated_at = ?, version = version + 1
             WHERE id = ? AND status = 'ACTIVE' AND is_deleted = 0
             """,
-            (_to_iso_utc(now), strategy_id),
+            (now_iso, strategy_id),
         )
         if cursor.rowcount <= 0:
             return
@@ -1781,16 +2023,13 @@ class StrategyExecutionEngine:
                 )
             return
 
+        expire_in_seconds = strategy_row["expire_in_seconds"]
         activated_at_iso = strategy_row["activated_at"] or now_iso
         logical_activated_at_iso = strategy_row["logical_activated_at"] or activated_at_iso
         expire_at_iso = strategy_row["expire_at"]
-        if (
-            expire_at_iso is None
-            and strategy_row["expire_mode"] == "relative"
-            and strategy_row["expire_in_seconds"]
-        ):
+        if expire_at_iso is None and strategy_row["expire_mode"] == "relative" and expire_in_seconds:
             base = _parse_iso_utc(logical_activated_at_iso) or now
-            expire_at_iso = _to_iso_utc(base + timedelta(seconds=int(strategy_row["expire_in_seconds"])))
+            expire_at_iso = _to_iso_utc(base + timedelta(seconds=int(expire_in_seconds)))
 
         cursor = conn.execute(
             """
@@ -1827,9 +2066,8 @@ class StrategyExecutionEngine:
 
     def _handle_triggered(self, conn: sqlite3.Connection, strategy_row: sqlite3.Row, now: datetime) -> None:
         strategy_id = str(strategy_row["id"])
-        trade_action_json = (
-            json.loads(strategy_row["trade_action_json"]) if strategy_row["trade_action_json"] else None
-        )
+        trade_action_raw = strategy_row["trade_action_json"]
+        trade_action_json = json.loads(trade_action_raw) if trade_action_raw else None
         next_strategy_id = _normalize_strategy_id(strategy_row["next_strategy_id"])
         now_iso = _to_iso_utc(now)
 
@@ -2017,6 +2255,7 @@ def build_execution_engine_from_config() -> StrategyExecutionEngine:
         waiting_for_market_data_event_throttle_seconds=(
             worker_cfg.waiting_for_market_data_event_throttle_seconds
         ),
+        pin_to_cpu=worker_cfg.pin_to_cpu,
         market_data_provider=market_data_provider,
     )
 
@@ -2026,4 +2265,21 @@ def build_execution_engine_from_env() -> StrategyExecutionEngine:
     return build_execution_engine_from_config()
 
 
-worker_engine = build_execution_engine_from_config()
+# 全局 worker engine：首次访问时才读取配置并构建
+_ENGINE_LOCK = Lock()
+_ENGINE: StrategyExecutionEngine | None = None
+
+
+def get_worker_engine() -> StrategyExecutionEngine:
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = build_execution_engine_from_config()
+        return _ENGINE
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: keep `from .worker import worker_engine` working without building at import.
+    if name == "worker_engine":
+        return get_worker_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
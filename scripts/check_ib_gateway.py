@@ -9,7 +9,9 @@ Checks:
 from __future__ import annotations
 
 import argparse
+import errno
 import os
+import selectors
 import socket
 import struct
 import sys
@@ -24,6 +26,13 @@ if str(ROOT) not in sys.path:
 
 from app.config import infer_ib_api_port, load_app_config
 
+# Handshake negotiated as: "API\\0" + 4-byte-len-prefixed "v<min>..<max>"
+MIN_CLIENT_VERSION = 157
+MAX_CLIENT_VERSION = 178
+_LEN_STRUCT = struct.Struct(">I")
+_CLIENT_VERSION_PAYLOAD = f"v{MIN_CLIENT_VERSION}..{MAX_CLIENT_VERSION}".encode("ascii")
+_HANDSHAKE_BYTES = b"API\0" + _LEN_STRUCT.pack(len(_CLIENT_VERSION_PAYLOAD)) + _CLIENT_VERSION_PAYLOAD
+
 
 @dataclass
 class CheckResult:
@@ -49,45 +58,51 @@ def parse_ports(raw: str) -> list[int]:
     return ports
 
 
-def check_tcp(host: str, port: int, timeout: float) -> CheckResult:
-    start = time.time()
-    try:
-        with socket.create_connection((host, port), timeout=timeout):
-            latency_ms = (time.time() - start) * 1000.0
-            return CheckResult(True, f"TCP connect ok ({latency_ms:.1f} ms)")
-    except OSError as exc:
-        return CheckResult(False, f"TCP connect failed: {exc}")
-
-
 def read_exact(sock: socket.socket, size: int) -> bytes:
-    buf = bytearray()
-    while len(buf) < size:
-        chunk = sock.recv(size - len(buf))
-        if not chunk:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    nread = 0
+    while nread < size:
+        n = sock.recv_into(view[nread:], size - nread)
+        if n == 0:
             raise ConnectionError("socket closed by peer")
-        buf.extend(chunk)
+        nread += n
     return bytes(buf)
 
 
 def read_frame(sock: socket.socket) -> bytes:
     header = read_exact(sock, 4)
-    (length,) = struct.unpack(">I", header)
+    (length,) = _LEN_STRUCT.unpack(header)
     if length == 0:
         return b""
     return read_exact(sock, length)
 
 
 def check_ib_handshake(host: str, port: int, timeout: float) -> CheckResult:
-    # Handshake negotiated as: "API\\0" + 4-byte-len-prefixed "v<min>..<max>"
-    min_client_version = 157
-    max_client_version = 178
-    payload = f"v{min_client_version}..{max_client_version}".encode("ascii")
-    framed = struct.pack(">I", len(payload)) + payload
+    return check_tcp_and_handshake(host, port, timeout)[1]
+
 
+def check_tcp_and_handshake(host: str, port: int, timeout: float) -> tuple[CheckResult, CheckResult]:
+    start = time.perf_counter()
     try:
-        with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock = socket.create_connection((host, port), timeout=timeout)
+    except OSError as exc:
+        return CheckResult(False, f"TCP connect failed: {exc}"), CheckResult(False, f"API handshake failed: {exc}")
+    latency_ms = (time.perf_counter() - start) * 1000.0
+    tcp_result = CheckResult(True, f"TCP connect ok ({latency_ms:.1f} ms)")
+    return tcp_result, _handshake(sock, timeout)
+
+
+def _handshake(sock: socket.socket, timeout: float) -> CheckResult:
+    try:
+        with sock:
             sock.settimeout(timeout)
-            sock.sendall(b"API\0" + framed)
+            # Tiny request/response exchange: don't let Nagle hold the frame back.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(_HANDSHAKE_BYTES)
+            if hasattr(socket, "TCP_QUICKACK"):
+                # Linux-only; keeps a delayed ACK from skewing a reply that arrives in two segments.
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
             server_reply = read_frame(sock)
             if not server_reply:
                 return CheckResult(False, "API handshake failed: empty reply")
@@ -106,11 +121,87 @@ def fmt_ports(ports: Iterable[int]) -> str:
     return ",".join(str(p) for p in ports)
 
 
+def _connect_failed(err: int) -> CheckResult:
+    return CheckResult(False, f"TCP connect failed: {OSError(err, os.strerror(err))}")
+
+
+def check_tcp_ports(host: str, ports: list[int], timeout: float) -> list[tuple[int, CheckResult]]:
+    # Non-blocking connects polled from one selector: wall time is bounded by the slowest port
+    # (at most one --timeout) instead of the sum over ports. Like create_connection, every
+    # resolved address is tried and a port passes as soon as any of them connects.
+    try:
+        addrs = list(
+            dict.fromkeys(
+                (family, sockaddr)
+                for family, _, _, _, sockaddr in socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            )
+        )
+    except OSError as exc:
+        return [(port, CheckResult(False, f"TCP connect failed: {exc}")) for port in ports]
+
+    results: dict[int, CheckResult] = {}
+    pending: dict[int, list[socket.socket]] = {port: [] for port in ports}
+    selector = selectors.DefaultSelector()
+    start = time.perf_counter()
+    try:
+        for port in ports:
+            last_err = 0
+            for family, sockaddr in addrs:
+                try:
+                    sock = socket.socket(family, socket.SOCK_STREAM)
+                except OSError as exc:
+                    last_err = exc.errno or errno.EAFNOSUPPORT
+                    continue
+                sock.setblocking(False)
+                err = sock.connect_ex((sockaddr[0], port, *sockaddr[2:]))
+                if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    sock.close()
+                    last_err = err
+                    continue
+                selector.register(sock, selectors.EVENT_WRITE, port)
+                pending[port].append(sock)
+            if not pending[port]:
+                results[port] = _connect_failed(last_err)
+
+        deadline = start + timeout
+        while selector.get_map():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(timeout=remaining):
+                port = key.data
+                if port in results:
+                    # A sibling address already decided this port and closed this socket.
+                    continue
+                sock = key.fileobj
+                selector.unregister(sock)
+                pending[port].remove(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                latency_ms = (time.perf_counter() - start) * 1000.0
+                sock.close()
+                if err:
+                    if not pending[port]:
+                        results[port] = _connect_failed(err)
+                    continue
+                results[port] = CheckResult(True, f"TCP connect ok ({latency_ms:.1f} ms)")
+                for other in pending[port]:
+                    selector.unregister(other)
+                    other.close()
+                pending[port] = []
+
+        for key in list(selector.get_map().values()):
+            selector.unregister(key.fileobj)
+            key.fileobj.close()
+            results.setdefault(key.data, CheckResult(False, "TCP connect failed: timed out"))
+    finally:
+        selector.close()
+    return [(port, results[port]) for port in ports]
+
+
 def main() -> int:
     cfg = load_app_config().ib_gateway
     trading_mode = os.getenv("TRADING_MODE", cfg.trading_mode).strip().lower()
     default_api_port = infer_ib_api_port(trading_mode)
-    default_ports = str(default_api_port)
 
     parser = argparse.ArgumentParser(description="Check IB Gateway TCP/API health")
     parser.add_argument(
@@ -121,7 +212,7 @@ def main() -> int:
     parser.add_argument(
         "--ports",
         type=parse_ports,
-        default=parse_ports(os.getenv("IB_PORTS", default_ports)),
+        default=os.getenv("IB_PORTS") or [default_api_port],
         help="Comma-separated TCP ports to probe (default: TRADING_MODE selected port)",
     )
     parser.add_argument(
@@ -144,9 +235,20 @@ def main() -> int:
     args = parser.parse_args()
 
     print(f"[INFO] host={args.host} ports={fmt_ports(args.ports)} timeout={args.timeout}s")
+    # A successful handshake already proves TCP reachability, so when the API port is also in
+    # --ports its connect doubles as the TCP probe instead of opening a second connection.
+    api_result: CheckResult | None = None
+    tcp_results: dict[int, CheckResult] = {}
+    probe_ports = list(args.ports)
+    if not args.skip_api and args.api_port in args.ports:
+        tcp_results[args.api_port], api_result = check_tcp_and_handshake(args.host, args.api_port, args.timeout)
+        probe_ports = [port for port in args.ports if port != args.api_port]
+    if probe_ports:
+        tcp_results.update(check_tcp_ports(args.host, probe_ports, args.timeout))
+
     any_tcp_ok = False
     for port in args.ports:
-        result = check_tcp(args.host, port, args.timeout)
+        result = tcp_results[port]
         status = "PASS" if result.ok else "FAIL"
         print(f"[{status}] tcp:{port} {result.message}")
         any_tcp_ok = any_tcp_ok or result.ok
@@ -159,7 +261,8 @@ def main() -> int:
         print("[PASS] TCP reachability check passed (API handshake skipped).")
         return 0
 
-    api_result = check_ib_handshake(args.host, args.api_port, args.timeout)
+    if api_result is None:
+        api_result = check_ib_handshake(args.host, args.api_port, args.timeout)
     api_status = "PASS" if api_result.ok else "FAIL"
     print(f"[{api_status}] api:{args.api_port} {api_result.message}")
     return 0 if api_result.ok else 2
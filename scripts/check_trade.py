@@ -9,18 +9,20 @@ import os
 import sys
 from dataclasses import asdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.config import infer_ib_api_port, load_app_config, resolve_ib_client_id
-from app.ib_trade_service import ActiveOrderSnapshot, IBOrderService
-from app.ib_session_manager import close_ib_session_manager
+from app.config import AppConfig, infer_ib_api_port, load_app_config, resolve_ib_client_id
 
+if TYPE_CHECKING:
+    from app.ib_trade_service import ActiveOrderSnapshot
 
-def parse_args() -> argparse.Namespace:
-    cfg = load_app_config().ib_gateway
+
+def parse_args(app_cfg: AppConfig) -> argparse.Namespace:
+    cfg = app_cfg.ib_gateway
     parser = argparse.ArgumentParser(description="Check IB trade service and list active IB orders")
     parser.add_argument("--host", default=os.getenv("IB_HOST", cfg.host), help="IB host")
     parser.add_argument(
@@ -58,8 +60,9 @@ def parse_args() -> argparse.Namespace:
     )
     args = parser.parse_args()
     if args.port is None:
-        if os.getenv("IB_API_PORT"):
-            args.port = int(os.getenv("IB_API_PORT", "0"))
+        env_port = os.getenv("IB_API_PORT")
+        if env_port:
+            args.port = int(env_port)
         else:
             mode = "live" if bool(args.live) else os.getenv("TRADING_MODE", cfg.trading_mode).strip().lower()
             args.port = infer_ib_api_port(mode)
@@ -96,7 +99,7 @@ def print_table(rows: list[ActiveOrderSnapshot]) -> None:
         "AvgFill",
     ]
     data_rows = [
-        [
+        (
             str(row.account_code or ""),
             row.symbol,
             row.sec_type,
@@ -111,28 +114,28 @@ def print_table(rows: list[ActiveOrderSnapshot]) -> None:
             str(row.con_id or ""),
             f"{row.limit_price:.4f}" if row.limit_price is not None else "",
             f"{row.avg_fill_price:.4f}" if row.avg_fill_price is not None else "",
-        ]
+        )
         for row in rows
     ]
-    widths = [len(h) for h in headers]
-    for r in data_rows:
-        for i, col in enumerate(r):
-            widths[i] = max(widths[i], len(col))
-
-    def _fmt(cols: list[str]) -> str:
-        return " | ".join(col.ljust(widths[i]) for i, col in enumerate(cols))
+    widths = [max(map(len, col)) for col in zip(headers, *data_rows)]
+    # One precompiled template per table: each row is then a single str.format call.
+    row_fmt = " | ".join(f"{{:<{w}}}" for w in widths)
 
-    print(_fmt(headers))
-    print("-+-".join("-" * w for w in widths))
-    for row in data_rows:
-        print(_fmt(row))
-    print()
-    print(f"[SUMMARY] active_orders={len(rows)}")
+    lines = [row_fmt.format(*headers), "-+-".join("-" * w for w in widths)]
+    lines.extend(row_fmt.format(*row) for row in data_rows)
+    lines.append("")
+    lines.append(f"[SUMMARY] active_orders={len(rows)}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> int:
-    args = parse_args()
-    cfg = load_app_config().ib_gateway
+    app_cfg = load_app_config()
+    args = parse_args(app_cfg)
+    # Imported after argument parsing: these pull in ib_insync, which --help never needs.
+    from app.ib_session_manager import close_ib_session_manager
+    from app.ib_trade_service import IBOrderService
+
+    cfg = app_cfg.ib_gateway
     service = IBOrderService(
         host=str(args.host),
         port=int(args.port),
@@ -7,16 +7,24 @@ import argparse
 import json
 import math
 import os
+import re
 import sys
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Mapping
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app.config import infer_ib_api_port, load_app_config, resolve_ib_client_id
+from app.config import (
+    AppConfig,
+    IBGatewayConfig,
+    infer_ib_api_port,
+    load_app_config,
+    resolve_ib_client_id,
+)
 from app.market_config import resolve_market_profile
 from app.market_data import (
     HistoricalBar,
@@ -25,19 +33,15 @@ from app.market_data import (
 )
 from app.runtime_paths import resolve_market_cache_db_path
 
-try:
-    from ib_insync import IB, Future, Stock
-except ModuleNotFoundError:
-    IB = None  # type: ignore[assignment]
-    Future = None  # type: ignore[assignment]
-    Stock = None  # type: ignore[assignment]
+if TYPE_CHECKING:
+    from ib_insync import IB
 
 
 UTC = timezone.utc
+_NON_DIGIT_RE = re.compile(r"\D")
 
 
-def infer_default_port() -> int:
-    cfg = load_app_config().ib_gateway
+def infer_default_port(cfg: IBGatewayConfig) -> int:
     mode = os.getenv("TRADING_MODE", cfg.trading_mode).strip().lower()
     return infer_ib_api_port(mode)
 
@@ -48,6 +52,7 @@ def _to_utc(dt: datetime) -> datetime:
     return dt.astimezone(UTC)
 
 
+@lru_cache(maxsize=32)
 def _parse_bar_size_delta(bar_size: str) -> timedelta | None:
     text = bar_size.strip().lower()
     parts = text.split()
@@ -138,19 +143,27 @@ def _coerce_ib_bar_ts(raw: Any) -> datetime:
         if not text:
             raise RuntimeError("empty bar date string")
         if len(text) == 8 and text.isdigit():
-            parsed = datetime.strptime(text, "%Y%m%d")
-            return parsed.replace(tzinfo=UTC)
+            return datetime(int(text[:4]), int(text[4:6]), int(text[6:8]), tzinfo=UTC)
         normalized = " ".join(text.split())
         try:
             parsed = datetime.fromisoformat(normalized.replace("Z", "+00:00"))
             return _to_utc(parsed)
         except ValueError:
             pass
-        try:
-            parsed = datetime.strptime(normalized, "%Y%m%d %H:%M:%S")
-            return parsed.replace(tzinfo=UTC)
-        except ValueError:
-            pass
+        # "%Y%m%d %H:%M:%S", sliced directly instead of going through strptime.
+        if len(normalized) == 17 and normalized[8] == " " and normalized[11] == ":" and normalized[14] == ":":
+            try:
+                return datetime(
+                    int(normalized[:4]),
+                    int(normalized[4:6]),
+                    int(normalized[6:8]),
+                    int(normalized[9:11]),
+                    int(normalized[12:14]),
+                    int(normalized[15:17]),
+                    tzinfo=UTC,
+                )
+            except ValueError:
+                pass
         raise RuntimeError(f"unsupported bar date string format: {text!r}")
     raise RuntimeError(f"unexpected bar date type: {type(raw)!r}")
 
@@ -199,8 +212,6 @@ class IBHistoricalFetcher:
         return out
 
     def _resolve_contract(self, contract: Mapping[str, Any] | str) -> Any:
-        if Stock is None or Future is None:
-            raise RuntimeError("ib_insync is required for IB-backed market data fetcher")
         if isinstance(contract, str):
             payload = {"market": "US_STOCK", "code": contract}
         else:
@@ -217,6 +228,11 @@ class IBHistoricalFetcher:
         if cached is not None:
             return cached
 
+        try:
+            from ib_insync import Future, Stock
+        except ModuleNotFoundError as exc:
+            raise RuntimeError("ib_insync is required for IB-backed market data fetcher") from exc
+
         profile = resolve_market_profile(market, None)
         if profile.sec_type == "STK":
             candidate = Stock(symbol=code, exchange=profile.exchange, currency=profile.currency)
@@ -292,7 +308,7 @@ class IBHistoricalFetcher:
             return raw[:8]
         if len(raw) == 6 and raw.isdigit():
             return raw + "99"
-        digits = "".join(ch for ch in raw if ch.isdigit())
+        digits = _NON_DIGIT_RE.sub("", raw)
         if len(digits) >= 8:
             return digits[:8]
         if len(digits) == 6:
@@ -300,8 +316,9 @@ class IBHistoricalFetcher:
         return "00000000"
 
 
-def parse_args() -> argparse.Namespace:
-    cfg = load_app_config().ib_gateway
+def parse_args(app_cfg: AppConfig) -> argparse.Namespace:
+    cfg = app_cfg.ib_gateway
+    env_port = os.getenv("IB_API_PORT")
     parser = argparse.ArgumentParser(description="Get latest completed historical bar by code")
     parser.add_argument("--code", required=True, help="Product code, e.g. AAPL or GC")
     parser.add_argument("--bar-size", required=True, help="IB bar size, e.g. '1 min', '5 mins', '1 hour'")
@@ -324,7 +341,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--port",
         type=int,
-        default=int(os.getenv("IB_API_PORT", str(infer_default_port()))),
+        default=int(env_port) if env_port else infer_default_port(cfg),
         help="IB API port",
     )
     parser.add_argument(
@@ -370,8 +387,8 @@ def parse_args() -> argparse.Namespace:
 
 
 def main() -> int:
-    args = parse_args()
     cfg = load_app_config()
+    args = parse_args(cfg)
     bar_delta = _parse_bar_size_delta(args.bar_size)
     now = _aligned_query_end(datetime.now(UTC), bar_delta)
 
@@ -387,7 +404,10 @@ def main() -> int:
                 now_fn=lambda: now,
             )
         else:
-            if IB is None:
+            # ib_insync (and its asyncio/eventkit stack) is only loaded on the IB-backed path.
+            try:
+                from ib_insync import IB
+            except ModuleNotFoundError:
                 print(
                     "[ERROR] Missing dependency: ib_insync. Install with: pip install ib_insync",
                     file=sys.stderr,
@@ -405,21 +425,18 @@ def main() -> int:
             except Exception as exc:  # noqa: BLE001
                 print(f"[ERROR] Failed to connect IB API: {exc}", file=sys.stderr)
                 return 1
+            # One IB session, fetcher (with its contract cache) and provider serve every lookback attempt.
             fetcher = IBHistoricalFetcher(ib)
-            cache = (
-                build_market_data_provider_from_config(
-                    fetcher=fetcher,
-                    now_fn=lambda: now,
-                )
-                if not args.cache_db.strip()
-                else build_market_data_provider_from_config(
-                    fetcher=fetcher,
-                    db_path=Path(args.cache_db.strip()),
-                    now_fn=lambda: now,
-                )
+            cache_db = args.cache_db.strip()
+            cache = build_market_data_provider_from_config(
+                fetcher=fetcher,
+                db_path=Path(cache_db) if cache_db else None,
+                now_fn=lambda: now,
             )
         result = None
-        for lookback in _lookback_candidates(bar_delta, args.lookback_bars):
+        candidates = _lookback_candidates(bar_delta, args.lookback_bars)
+        # max_bars=1 bounds the reply, so after a miss on the narrowest window go straight to the widest.
+        for lookback in dict.fromkeys((candidates[0], candidates[-1])):
             start = now - lookback
             current = cache.get_historical_bars(
                 HistoricalBarsRequest(
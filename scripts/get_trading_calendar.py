@@ -6,8 +6,11 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import sys
-from datetime import datetime, time, timedelta, timezone
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
@@ -16,21 +19,66 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app.config import infer_ib_api_port, load_app_config, resolve_ib_client_id
+from app.config import (
+    AppConfig,
+    IBGatewayConfig,
+    infer_ib_api_port,
+    load_app_config,
+    resolve_ib_client_id,
+)
 from app.market_config import resolve_market_profile
 
 
 UTC = timezone.utc
 ET = ZoneInfo("America/New_York")
-LOCAL_TZ = datetime.now().astimezone().tzinfo or ET
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
+@lru_cache(maxsize=1)
+def _local_tz() -> tzinfo:
+    return datetime.now().astimezone().tzinfo or ET
+
+
+@lru_cache(maxsize=None)
+def _tz(name: str) -> ZoneInfo:
+    # Unknown names fall back to ET; cached so a bad name only raises once per process.
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return ET
 
 
 def _iso_utc(dt: datetime) -> str:
-    return dt.astimezone(UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    u = dt.astimezone(UTC)
+    return f"{u.year:04d}-{u.month:02d}-{u.day:02d}T{u.hour:02d}:{u.minute:02d}:{u.second:02d}Z"
+
+
+def _fmt_local(dt: datetime) -> str:
+    # Same output as strftime("%Y-%m-%d %H:%M:%S %Z") without the per-call format parsing.
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} {dt.tzname() or ''}"
+    )
 
 
-def _parse_schedule_dt(value: str, *, fallback_tz: ZoneInfo) -> datetime:
+def _parse_schedule_dt(value: str, fallback_tz: ZoneInfo) -> datetime:
     text = str(value).strip()
+    # IB sends fixed-width "YYYYMMDD-HH:MM:SS" (or " " separated) and "YYYYMMDD"; slice those directly.
+    try:
+        if len(text) == 17 and text[8] in "- " and text[11] == ":" and text[14] == ":":
+            return datetime(
+                int(text[:4]),
+                int(text[4:6]),
+                int(text[6:8]),
+                int(text[9:11]),
+                int(text[12:14]),
+                int(text[15:17]),
+                tzinfo=fallback_tz,
+            )
+        if len(text) == 8 and text.isdigit():
+            return datetime(int(text[:4]), int(text[4:6]), int(text[6:8]), tzinfo=fallback_tz)
+    except ValueError:
+        pass
     for fmt in ("%Y%m%d-%H:%M:%S", "%Y%m%d %H:%M:%S", "%Y%m%d"):
         try:
             parsed = datetime.strptime(text, fmt)
@@ -42,32 +90,35 @@ def _parse_schedule_dt(value: str, *, fallback_tz: ZoneInfo) -> datetime:
 
 def _pick_front_future_contract(ib: Any, details: list[Any]) -> Any:
     today = datetime.now(UTC).strftime("%Y%m%d")
-    entries: list[tuple[str, str, Any]] = []
+    entries: list[tuple[str, Any]] = []
     for detail in details:
         contract = detail.contract
         month = str(getattr(contract, "lastTradeDateOrContractMonth", "")).strip()
         if not month:
             continue
-        digits = "".join(ch for ch in month if ch.isdigit())
+        digits = _NON_DIGIT_RE.sub("", month)
         if len(digits) >= 8:
             cmp_day = digits[:8]
         elif len(digits) == 6:
             cmp_day = digits + "99"
         else:
             continue
-        entries.append((month, cmp_day, contract))
+        entries.append((cmp_day, contract))
     if not entries:
         raise RuntimeError("failed to resolve front future contract: no dated contract details")
 
-    entries.sort(key=lambda item: item[1])
-    for _, cmp_day, contract in entries:
-        if cmp_day < today:
-            continue
-        qualified = list(ib.qualifyContracts(contract))
+    # The nearest upcoming contract almost always qualifies, so take it with min() rather than
+    # sorting the whole chain; later ones are only tried if it does not.
+    upcoming = [entry for entry in entries if entry[0] >= today]
+    while upcoming:
+        nearest = min(upcoming, key=itemgetter(0))
+        qualified = list(ib.qualifyContracts(nearest[1]))
         if qualified:
             return qualified[0]
+        upcoming = [entry for entry in upcoming if entry is not nearest]
 
-    qualified = list(ib.qualifyContracts(entries[-1][2]))
+    latest = max(reversed(entries), key=itemgetter(0))
+    qualified = list(ib.qualifyContracts(latest[1]))
     if qualified:
         return qualified[0]
     raise RuntimeError("failed to qualify front future contract")
@@ -119,14 +170,14 @@ def _resolve_contract_with_ib(ib: Any, *, code: str, market: str, contract_month
     return _pick_front_future_contract(ib, details)
 
 
-def infer_default_port() -> int:
-    cfg = load_app_config().ib_gateway
+def infer_default_port(cfg: IBGatewayConfig) -> int:
     mode = os.getenv("TRADING_MODE", cfg.trading_mode).strip().lower()
     return infer_ib_api_port(mode)
 
 
-def parse_args() -> argparse.Namespace:
-    cfg = load_app_config().ib_gateway
+def parse_args(app_cfg: AppConfig) -> argparse.Namespace:
+    cfg = app_cfg.ib_gateway
+    env_port = os.getenv("IB_API_PORT")
     parser = argparse.ArgumentParser(description="Get local-time trading calendar for today and tomorrow")
     parser.add_argument("--code", required=True, help="Product code, e.g. SLV or GC")
     parser.add_argument(
@@ -147,7 +198,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--port",
         type=int,
-        default=int(os.getenv("IB_API_PORT", str(infer_default_port()))),
+        default=int(env_port) if env_port else infer_default_port(cfg),
         help="IB API port",
     )
     parser.add_argument(
@@ -185,17 +236,18 @@ def parse_args() -> argparse.Namespace:
 
 
 def main() -> int:
-    args = parse_args()
+    args = parse_args(load_app_config())
     market = str(args.market).strip().upper()
     contract_month = str(args.contract_month).strip() or None
     use_rth = bool(args.use_rth)
 
-    now_local = datetime.now(LOCAL_TZ)
+    local_tz = _local_tz()
+    now_local = datetime.now(local_tz)
     today_local = now_local.date()
     tomorrow_local = today_local + timedelta(days=1)
     target_dates_local = {today_local, tomorrow_local}
     # Pull through local tomorrow end-of-day to ensure both days are covered.
-    end_dt_local = datetime.combine(tomorrow_local, time(23, 59, 59), tzinfo=LOCAL_TZ)
+    end_dt_local = datetime.combine(tomorrow_local, time(23, 59, 59), tzinfo=local_tz)
 
     try:
         from ib_insync import IB
@@ -238,32 +290,31 @@ def main() -> int:
         except Exception:
             pass
 
-    schedule_tz_name = str(getattr(schedule, "timeZone", "") or "America/New_York")
-    try:
-        schedule_tz = ZoneInfo(schedule_tz_name)
-    except Exception:
-        schedule_tz = ET
-        schedule_tz_name = "America/New_York"
+    schedule_tz = _tz(str(getattr(schedule, "timeZone", "") or "America/New_York"))
+    schedule_tz_name = schedule_tz.key
+
+    # ib_insync returns [] instead of a HistoricalSchedule when IB rejects the request.
+    sessions = getattr(schedule, "sessions", None) or ()
 
     rows: list[dict[str, str]] = []
-    for session in list(getattr(schedule, "sessions", []) or []):
-        ref_date = str(getattr(session, "refDate", "")).strip()
-        start_raw = str(getattr(session, "startDateTime", "")).strip()
-        end_raw = str(getattr(session, "endDateTime", "")).strip()
+    for session in sessions:
+        ref_date = session.refDate.strip()
+        start_raw = session.startDateTime.strip()
+        end_raw = session.endDateTime.strip()
         if not start_raw or not end_raw:
             continue
-        start_exchange = _parse_schedule_dt(start_raw, fallback_tz=schedule_tz)
-        end_exchange = _parse_schedule_dt(end_raw, fallback_tz=schedule_tz)
-        start_local = start_exchange.astimezone(LOCAL_TZ)
-        end_local = end_exchange.astimezone(LOCAL_TZ)
+        start_exchange = _parse_schedule_dt(start_raw, schedule_tz)
+        end_exchange = _parse_schedule_dt(end_raw, schedule_tz)
+        start_local = start_exchange.astimezone(local_tz)
+        end_local = end_exchange.astimezone(local_tz)
         # Keep only sessions touching local today/tomorrow.
         if (start_local.date() not in target_dates_local) and (end_local.date() not in target_dates_local):
             continue
         rows.append(
             {
                 "ref_date": ref_date,
-                "start_local": start_local.strftime("%Y-%m-%d %H:%M:%S %Z"),
-                "end_local": end_local.strftime("%Y-%m-%d %H:%M:%S %Z"),
+                "start_local": _fmt_local(start_local),
+                "end_local": _fmt_local(end_local),
                 "start_utc": _iso_utc(start_local),
                 "end_utc": _iso_utc(end_local),
             }
@@ -276,8 +327,8 @@ def main() -> int:
         "market": market,
         "contract_month": contract_month,
         "use_rth": use_rth,
-        "now_local": now_local.strftime("%Y-%m-%d %H:%M:%S %Z"),
-        "local_timezone": str(LOCAL_TZ),
+        "now_local": _fmt_local(now_local),
+        "local_timezone": str(local_tz),
         "today_local": today_local.isoformat(),
         "tomorrow_local": tomorrow_local.isoformat(),
         "schedule_timezone": schedule_tz_name,
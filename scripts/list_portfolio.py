@@ -10,7 +10,7 @@ import argparse
 import json
 import os
 import sys
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -18,16 +18,13 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.config import infer_ib_api_port, load_app_config, resolve_ib_client_id
-
-try:
-    from ib_insync import IB
-except ModuleNotFoundError:
-    print(
-        "[ERROR] Missing dependency: ib_insync. Install with: pip install ib_insync",
-        file=sys.stderr,
-    )
-    sys.exit(3)
+from app.config import (
+    AppConfig,
+    IBGatewayConfig,
+    infer_ib_api_port,
+    load_app_config,
+    resolve_ib_client_id,
+)
 
 
 @dataclass
@@ -46,14 +43,13 @@ class Holding:
     weight_pct: float = 0.0
 
 
-def infer_default_port() -> int:
-    cfg = load_app_config().ib_gateway
+def infer_default_port(cfg: IBGatewayConfig) -> int:
     mode = os.getenv("TRADING_MODE", cfg.trading_mode).strip().lower()
     return infer_ib_api_port(mode)
 
 
-def parse_args() -> argparse.Namespace:
-    cfg = load_app_config().ib_gateway
+def parse_args(app_cfg: AppConfig) -> argparse.Namespace:
+    cfg = app_cfg.ib_gateway
     parser = argparse.ArgumentParser(description="List current IB portfolio holdings")
     parser.add_argument("--host", default=os.getenv("IB_HOST", cfg.host), help="IB host")
     parser.add_argument(
@@ -92,8 +88,9 @@ def parse_args() -> argparse.Namespace:
     args = parser.parse_args()
 
     if args.port is None:
-        if os.getenv("IB_API_PORT"):
-            args.port = int(os.getenv("IB_API_PORT", "0"))
+        env_port = os.getenv("IB_API_PORT")
+        if env_port:
+            args.port = int(env_port)
         else:
             mode = "live" if bool(args.live) else os.getenv("TRADING_MODE", cfg.trading_mode).strip().lower()
             args.port = infer_ib_api_port(mode)
@@ -102,30 +99,33 @@ def parse_args() -> argparse.Namespace:
 
 def build_holdings(items: list[Any], account_filter: str) -> list[Holding]:
     holdings: list[Holding] = []
+    total_mv = 0.0
     for item in items:
         if account_filter and item.account != account_filter:
             continue
         c = item.contract
+        market_value = float(item.marketValue)
+        total_mv += market_value
         holdings.append(
             Holding(
                 account=item.account,
-                symbol=getattr(c, "localSymbol", "") or getattr(c, "symbol", ""),
-                sec_type=getattr(c, "secType", ""),
-                currency=getattr(c, "currency", ""),
-                exchange=getattr(c, "exchange", ""),
+                symbol=c.localSymbol or c.symbol,
+                sec_type=c.secType,
+                currency=c.currency,
+                exchange=c.exchange,
                 position=float(item.position),
                 market_price=float(item.marketPrice),
-                market_value=float(item.marketValue),
+                market_value=market_value,
                 average_cost=float(item.averageCost),
                 unrealized_pnl=float(item.unrealizedPNL),
                 realized_pnl=float(item.realizedPNL),
             )
         )
 
-    total_mv = sum(h.market_value for h in holdings)
     if total_mv != 0:
+        pct_per_value = 100.0 / total_mv
         for h in holdings:
-            h.weight_pct = h.market_value / total_mv * 100
+            h.weight_pct = h.market_value * pct_per_value
 
     holdings.sort(key=lambda x: abs(x.market_value), reverse=True)
     return holdings
@@ -150,7 +150,7 @@ def print_table(holdings: list[Holding]) -> None:
     ]
 
     rows = [
-        [
+        (
             h.account,
             h.symbol,
             h.sec_type,
@@ -161,22 +161,17 @@ def print_table(holdings: list[Holding]) -> None:
             f"{h.unrealized_pnl:.2f}",
             f"{h.realized_pnl:.2f}",
             f"{h.weight_pct:.2f}",
-        ]
+        )
         for h in holdings
     ]
 
-    widths = [len(h) for h in headers]
-    for row in rows:
-        for i, col in enumerate(row):
-            widths[i] = max(widths[i], len(col))
-
-    def fmt_line(cols: list[str]) -> str:
-        return " | ".join(col.ljust(widths[i]) for i, col in enumerate(cols))
+    widths = [max(map(len, col)) for col in zip(headers, *rows)]
+    row_fmt = " | ".join(f"{{:<{w}}}" for w in widths)
 
-    print(fmt_line(headers))
+    print(row_fmt.format(*headers))
     print("-+-".join("-" * w for w in widths))
     for row in rows:
-        print(fmt_line(row))
+        print(row_fmt.format(*row))
 
     total_mv = sum(h.market_value for h in holdings)
     total_unreal = sum(h.unrealized_pnl for h in holdings)
@@ -189,7 +184,16 @@ def print_table(holdings: list[Holding]) -> None:
 
 
 def main() -> int:
-    args = parse_args()
+    args = parse_args(load_app_config())
+    try:
+        from ib_insync import IB
+    except ModuleNotFoundError:
+        print(
+            "[ERROR] Missing dependency: ib_insync. Install with: pip install ib_insync",
+            file=sys.stderr,
+        )
+        return 3
+
     ib = IB()
 
     try:
@@ -209,7 +213,7 @@ def main() -> int:
         holdings = build_holdings(raw_items, args.account.strip())
 
         if args.json:
-            print(json.dumps([asdict(h) for h in holdings], ensure_ascii=False, indent=2))
+            print(json.dumps([vars(h) for h in holdings], ensure_ascii=False, indent=2))
         else:
             print_table(holdings)
         return 0
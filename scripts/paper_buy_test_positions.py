@@ -7,7 +7,8 @@ import argparse
 import json
 import os
 import sys
-from dataclasses import dataclass, asdict
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -15,8 +16,8 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.config import load_app_config, resolve_ib_client_id
-from app.ib_session_manager import close_ib_session_manager, get_ib_session_manager
+from app.config import AppConfig, load_app_config, resolve_ib_client_id
+from app.ib_session_manager import IBClientSession, close_ib_session_manager, get_ib_session_manager
 from app.ib_trade_service import IBOrderService
 
 
@@ -32,8 +33,8 @@ class OrderResult:
     avg_fill_price: float | None
 
 
-def parse_args() -> argparse.Namespace:
-    cfg = load_app_config().ib_gateway
+def parse_args(app_cfg: AppConfig) -> argparse.Namespace:
+    cfg = app_cfg.ib_gateway
     parser = argparse.ArgumentParser(description="Buy paper positions for testing")
     parser.add_argument(
         "--symbols",
@@ -90,7 +91,7 @@ def parse_args() -> argparse.Namespace:
         "--wait-fill-seconds",
         type=float,
         default=8.0,
-        help="Max seconds to wait per order for terminal status (default: 8)",
+        help="Max seconds to wait for submitted orders to reach terminal status (default: 8)",
     )
     parser.add_argument(
         "--outside-rth",
@@ -112,50 +113,27 @@ def parse_args() -> argparse.Namespace:
 
 
 def _parse_symbols(raw: str) -> list[str]:
-    symbols: list[str] = []
-    for part in str(raw).split(","):
-        symbol = part.strip().upper()
-        if not symbol:
-            continue
-        symbols.append(symbol)
-    deduped: list[str] = []
-    seen: set[str] = set()
-    for symbol in symbols:
-        if symbol in seen:
-            continue
-        seen.add(symbol)
-        deduped.append(symbol)
-    return deduped
+    # dict keeps first-seen order, so this dedups in a single pass.
+    symbols = (part.strip().upper() for part in str(raw).split(","))
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
 
 
-def _qualify_symbol(
-    *,
-    host: str,
-    port: int,
-    client_id: int,
-    timeout_seconds: float,
-    idle_ttl_seconds: float,
-    symbol: str,
-) -> int | None:
-    session = get_ib_session_manager().get_session(
-        host=host,
-        port=port,
-        client_id=client_id,
-        timeout_seconds=timeout_seconds,
-        readonly=True,
-        idle_ttl_seconds=idle_ttl_seconds,
-    )
-
-    def _run(ib: Any) -> int | None:
+def _qualify_symbols(session: IBClientSession, symbols: list[str]) -> dict[str, int | None]:
+    def _run(ib: Any) -> dict[str, int | None]:
         try:
             from ib_insync import Stock
         except ModuleNotFoundError as exc:
             raise RuntimeError("ib_insync is not installed") from exc
-        contract = Stock(symbol=symbol, exchange="SMART", currency="USD")
-        qualified = list(ib.qualifyContracts(contract))
-        if not qualified:
-            raise RuntimeError(f"failed to qualify contract: {symbol}")
-        return int(getattr(qualified[0], "conId", 0) or 0) or None
+        contracts = [Stock(symbol=symbol, exchange="SMART", currency="USD") for symbol in symbols]
+        # One batched call: ib_insync resolves the contracts concurrently and fills conId in place.
+        ib.qualifyContracts(*contracts)
+        con_ids: dict[str, int | None] = {}
+        for symbol, contract in zip(symbols, contracts):
+            con_id = int(getattr(contract, "conId", 0) or 0) or None
+            if con_id is None:
+                raise RuntimeError(f"failed to qualify contract: {symbol}")
+            con_ids[symbol] = con_id
+        return con_ids
 
     return session.run(_run)
 
@@ -176,8 +154,9 @@ def _build_trade_action(args: argparse.Namespace, *, symbol: str) -> dict[str, A
 
 
 def main() -> int:
-    args = parse_args()
-    cfg = load_app_config().ib_gateway
+    app_cfg = load_app_config()
+    args = parse_args(app_cfg)
+    cfg = app_cfg.ib_gateway
     symbols = _parse_symbols(args.symbols)
     if not symbols:
         print("[ERROR] no valid symbols", file=sys.stderr)
@@ -212,20 +191,23 @@ def main() -> int:
 
     try:
         results: list[OrderResult] = []
+        dry_run_con_ids: dict[str, int | None] = {}
+        if args.dry_run:
+            session = get_ib_session_manager().get_session(
+                host=str(args.host),
+                port=int(args.port),
+                client_id=int(args.client_id),
+                timeout_seconds=float(args.timeout),
+                readonly=True,
+                idle_ttl_seconds=float(cfg.session_idle_ttl_seconds),
+            )
+            dry_run_con_ids = _qualify_symbols(session, symbols)
         for symbol in symbols:
             if args.dry_run:
-                con_id = _qualify_symbol(
-                    host=str(args.host),
-                    port=int(args.port),
-                    client_id=int(args.client_id),
-                    timeout_seconds=float(args.timeout),
-                    idle_ttl_seconds=float(cfg.session_idle_ttl_seconds),
-                    symbol=symbol,
-                )
                 results.append(
                     OrderResult(
                         symbol=symbol,
-                        con_id=con_id,
+                        con_id=dry_run_con_ids[symbol],
                         order_id=None,
                         perm_id=None,
                         status="DRY_RUN",
@@ -242,34 +224,35 @@ def main() -> int:
                 account_code=args.account,
                 order_ref=f"PAPER-{symbol}",
             )
-            con_id = submit.con_id
-            status = str(submit.normalized_status or submit.status or "UNKNOWN")
-            filled = float(submit.filled_qty)
-            remaining = float(submit.remaining_qty)
-            avg_fill_price = submit.avg_fill_price
-            if submit.order_id is not None and float(args.wait_fill_seconds) > 0:
-                snapshot = order_service.wait_for_terminal_status(
-                    order_id=submit.order_id,
-                    timeout_seconds=float(args.wait_fill_seconds),
-                    poll_interval_seconds=0.5,
-                )
-                if snapshot is not None:
-                    status = str(snapshot.normalized_status or snapshot.status or status)
-                    filled = float(snapshot.filled_qty)
-                    remaining = float(snapshot.remaining_qty)
-                    avg_fill_price = snapshot.avg_fill_price
             results.append(
                 OrderResult(
                     symbol=symbol,
-                    con_id=con_id,
+                    con_id=submit.con_id,
                     order_id=submit.order_id,
                     perm_id=submit.perm_id,
-                    status=status,
-                    filled=filled,
-                    remaining=remaining,
-                    avg_fill_price=avg_fill_price,
+                    status=str(submit.normalized_status or submit.status or "UNKNOWN"),
+                    filled=float(submit.filled_qty),
+                    remaining=float(submit.remaining_qty),
+                    avg_fill_price=submit.avg_fill_price,
                 )
             )
+
+        # All orders are in flight before waiting, so they fill concurrently under one shared deadline.
+        if not args.dry_run and float(args.wait_fill_seconds) > 0:
+            deadline = time.monotonic() + float(args.wait_fill_seconds)
+            for result in results:
+                if result.order_id is None:
+                    continue
+                snapshot = order_service.wait_for_terminal_status(
+                    order_id=result.order_id,
+                    timeout_seconds=max(0.0, deadline - time.monotonic()),
+                    poll_interval_seconds=0.5,
+                )
+                if snapshot is not None:
+                    result.status = str(snapshot.normalized_status or snapshot.status or result.status)
+                    result.filled = float(snapshot.filled_qty)
+                    result.remaining = float(snapshot.remaining_qty)
+                    result.avg_fill_price = snapshot.avg_fill_price
     except Exception as exc:  # noqa: BLE001
         if "ib_insync is not installed" in str(exc):
             print(
@@ -283,7 +266,7 @@ def main() -> int:
         close_ib_session_manager()
 
     if args.json:
-        print(json.dumps([asdict(item) for item in results], ensure_ascii=False, indent=2))
+        print(json.dumps([vars(item) for item in results], ensure_ascii=False, indent=2))
     else:
         for row in results:
             print(
@@ -5,27 +5,37 @@ from __future__ import annotations
 
 import argparse
 import logging
+import math
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from operator import methodcaller
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.config import infer_ib_api_port, load_app_config, resolve_ib_client_id
-from app.ib_session_manager import close_ib_session_manager, get_ib_session_manager
+from app.config import AppConfig, infer_ib_api_port, load_app_config
+
+if TYPE_CHECKING:
+    from app.ib_session_manager import IBSessionManager
 
 DEFAULT_TEST_TTL_SECONDS = 5.0
 DEFAULT_WAIT_EXTRA_SECONDS = 1.0
+_REQ_CURRENT_TIME = methodcaller("reqCurrentTime")
+_IS_CONNECTED = methodcaller("isConnected")
+_REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
 
 
 @dataclass(frozen=True)
 class TimeProbeResult:
     name: str
-    elapsed_seconds: float
+    connect_ns: int
+    request_ns: int
     server_time: str
 
 
@@ -38,8 +48,12 @@ def _probe_ib_current_time(
     timeout_seconds: float,
     readonly: bool,
     idle_ttl_seconds: float,
+    manager: IBSessionManager | None = None,
 ) -> TimeProbeResult:
-    manager = get_ib_session_manager()
+    if manager is None:
+        from app.ib_session_manager import get_ib_session_manager
+
+        manager = get_ib_session_manager()
     session = manager.get_session(
         host=host,
         port=port,
@@ -48,26 +62,66 @@ def _probe_ib_current_time(
         readonly=readonly,
         idle_ttl_seconds=idle_ttl_seconds,
     )
-    start = time.perf_counter()
-    server_time_obj = session.run(lambda ib: ib.reqCurrentTime())
-    elapsed = time.perf_counter() - start
+    # The session connects lazily inside run(), so a no-op call first isolates (re)connect time
+    # from the request round-trip: connect is ~0 when the cached connection was reused.
+    t0 = time.perf_counter_ns()
+    session.run(_IS_CONNECTED)
+    t1 = time.perf_counter_ns()
+    server_time_obj = session.run(_REQ_CURRENT_TIME)
+    t2 = time.perf_counter_ns()
     if hasattr(server_time_obj, "isoformat"):
         server_time = str(server_time_obj.isoformat())
     else:
         server_time = str(server_time_obj)
-    return TimeProbeResult(name=name, elapsed_seconds=elapsed, server_time=server_time)
+    return TimeProbeResult(name=name, connect_ns=t1 - t0, request_ns=t2 - t1, server_time=server_time)
 
 
-def _print_time_probe(result: TimeProbeResult) -> None:
-    print(
-        "[PASS] "
-        f"{result.name}: elapsed={result.elapsed_seconds:.3f}s "
-        f"server_time={result.server_time}"
+def _print_time_probes(results: list[TimeProbeResult]) -> None:
+    # One write per probe round rather than one per client id.
+    sys.stdout.write(
+        "".join(
+            "[PASS] "
+            f"{result.name}: connect={result.connect_ns / 1e6:.3f}ms request={result.request_ns / 1e6:.3f}ms "
+            f"server_time={result.server_time}\n"
+            for result in results
+        )
     )
+    sys.stdout.flush()
 
 
-def parse_args() -> argparse.Namespace:
-    cfg = load_app_config().ib_gateway
+def _print_request_percentiles(samples_ns: list[int]) -> None:
+    ordered = sorted(samples_ns)
+    count = len(ordered)
+    # Nearest-rank percentiles; the sample count is bounded by --iterations * --concurrency.
+    parts = [
+        f"p{pct:g}={ordered[max(0, math.ceil(pct / 100.0 * count) - 1)] / 1e6:.3f}ms"
+        for pct in _REPORT_PERCENTILES
+    ]
+    print(f"[INFO] request latency over {count} samples: {' '.join(parts)} max={ordered[-1] / 1e6:.3f}ms")
+
+
+def _positive_float(raw: str) -> float:
+    try:
+        value = float(raw)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {raw!r}") from None
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be > 0, got {raw}")
+    return value
+
+
+def _positive_int(raw: str) -> int:
+    try:
+        value = int(raw)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {raw!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {raw}")
+    return value
+
+
+def parse_args(app_cfg: AppConfig) -> argparse.Namespace:
+    cfg = app_cfg.ib_gateway
     parser = argparse.ArgumentParser(description="Test real IB reconnect after idle TTL")
     parser.add_argument("--host", default=os.getenv("IB_HOST", cfg.host), help="IB host")
     parser.add_argument(
@@ -79,7 +133,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--client-id",
         type=int,
-        default=int(os.getenv("IB_CLIENT_ID", str(resolve_ib_client_id("broker_data")))),
+        default=int(os.getenv("IB_CLIENT_ID", str(cfg.client_ids.broker_data))),
         help="IB client id",
     )
     parser.add_argument(
@@ -96,89 +150,180 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--ttl",
-        type=float,
+        type=_positive_float,
         default=DEFAULT_TEST_TTL_SECONDS,
         help="Session idle TTL seconds (default: 5)",
     )
     parser.add_argument(
         "--wait",
-        type=float,
+        type=_positive_float,
         default=None,
         help="Wait seconds between probe #1 and #2 (default: ttl + 1)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=1,
+        help="Probe client ids client_id..client_id+N-1 in parallel, sharing one wait (default: 1)",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=_positive_int,
+        default=1,
+        help="Requests per client id after the reconnect; >1 also prints request latency percentiles (default: 1)",
+    )
+    parser.add_argument(
+        "--prewarm",
+        action="store_true",
+        help="Connect every client id concurrently before probe #1 so it measures a warm session",
+    )
+    parser.add_argument(
+        "--cpu-affinity",
+        type=int,
+        default=None,
+        metavar="CORE",
+        help="Pin the process (and the session worker threads it starts) to one CPU core (Linux only)",
+    )
     parser.add_argument(
         "--no-reap",
         action="store_true",
         help="Do not force manager.reap_once() after waiting",
     )
+    parser.add_argument(
+        "--fast-expire",
+        action="store_true",
+        help="Skip the real wait; reap sessions as if --wait seconds had passed",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only print the final result, latency percentiles and failures; session logs drop to WARNING",
+    )
     parser.add_argument(
         "--readwrite",
         action="store_true",
         help="Use readonly=False when connecting",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.wait is None:
+        args.wait = args.ttl + DEFAULT_WAIT_EXTRA_SECONDS
+    if args.wait <= args.ttl:
+        parser.error("--wait must be > --ttl for reconnect test")
+    if args.fast_expire and args.no_reap:
+        parser.error("--fast-expire expires sessions through reap_once(); drop --no-reap")
+    if args.port is None:
+        args.port = infer_ib_api_port(args.trading_mode)
+    return args
 
 
 def main() -> int:
-    args = parse_args()
-    wait_seconds = float(args.wait if args.wait is not None else args.ttl + DEFAULT_WAIT_EXTRA_SECONDS)
-    if args.ttl <= 0:
-        print("[FAIL] --ttl must be > 0", file=sys.stderr)
-        return 2
-    if wait_seconds <= 0:
-        print("[FAIL] --wait must be > 0", file=sys.stderr)
-        return 2
-    if wait_seconds <= args.ttl:
-        print("[FAIL] --wait must be > --ttl for reconnect test", file=sys.stderr)
-        return 2
+    args = parse_args(load_app_config())
+    wait_seconds = args.wait
+    if args.cpu_affinity is not None:
+        if not hasattr(os, "sched_setaffinity"):
+            print("[FAIL] --cpu-affinity is not supported on this platform", file=sys.stderr)
+            return 2
+        try:
+            # Set before any session worker thread exists; new threads inherit the mask.
+            os.sched_setaffinity(0, {args.cpu_affinity})
+        except (OSError, ValueError) as exc:
+            print(f"[FAIL] --cpu-affinity {args.cpu_affinity}: {exc}", file=sys.stderr)
+            return 2
 
-    if args.port is None:
-        args.port = infer_ib_api_port(args.trading_mode)
+    # ib_insync (pulled in by the session manager) is only imported once the arguments are valid.
+    from app.ib_session_manager import close_ib_session_manager, get_ib_session_manager
 
     readonly = not bool(args.readwrite)
+    client_ids = [args.client_id + i for i in range(args.concurrency)]
 
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
-    print(
-        "[INFO] "
-        f"host={args.host} port={args.port} client_id={args.client_id} "
-        f"readonly={readonly} ttl={args.ttl}s wait={wait_seconds}s"
+    verbose = not args.quiet
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
     )
-
-    try:
-        time_first = _probe_ib_current_time(
-            name="ib_time#1",
-            host=args.host,
-            port=int(args.port),
-            client_id=int(args.client_id),
-            timeout_seconds=float(args.timeout),
-            readonly=readonly,
-            idle_ttl_seconds=float(args.ttl),
+    if verbose:
+        print(
+            "[INFO] "
+            f"host={args.host} port={args.port} client_id={args.client_id} "
+            f"readonly={readonly} ttl={args.ttl}s wait={wait_seconds}s concurrency={args.concurrency}"
         )
-        _print_time_probe(time_first)
-
-        print(f"[INFO] sleep {wait_seconds:.1f}s to exceed idle TTL...")
-        time.sleep(wait_seconds)
-
-        if not args.no_reap:
-            print("[INFO] manager.reap_once()")
-            get_ib_session_manager().reap_once()
-
-        time_second = _probe_ib_current_time(
-            name="ib_time#2",
-            host=args.host,
-            port=int(args.port),
-            client_id=int(args.client_id),
-            timeout_seconds=float(args.timeout),
-            readonly=readonly,
-            idle_ttl_seconds=float(args.ttl),
+
+    manager = get_ib_session_manager()
+    # Every client id gets its own session, so both rounds fan out and share a single TTL wait.
+    executor = ThreadPoolExecutor(max_workers=len(client_ids), thread_name_prefix="ttl-probe")
+
+    probe_kwargs = dict(
+        host=args.host,
+        port=args.port,
+        timeout_seconds=args.timeout,
+        readonly=readonly,
+        idle_ttl_seconds=args.ttl,
+        manager=manager,
+    )
+
+    def probe_round(round_no: int) -> list[TimeProbeResult]:
+        return list(
+            executor.map(
+                lambda cid: _probe_ib_current_time(
+                    name=f"ib_time#{round_no} client_id={cid}", client_id=cid, **probe_kwargs
+                ),
+                client_ids,
+            )
         )
-        _print_time_probe(time_second)
+
+    try:
+        if args.prewarm:
+            if verbose:
+                print(f"[INFO] manager.prewarm() {len(client_ids)} session(s)")
+            manager.prewarm(
+                [
+                    manager.get_session(
+                        host=args.host,
+                        port=args.port,
+                        client_id=cid,
+                        timeout_seconds=args.timeout,
+                        readonly=readonly,
+                        idle_ttl_seconds=args.ttl,
+                    )
+                    for cid in client_ids
+                ]
+            )
+        # Per-probe lines are only formatted when they will be shown.
+        first_results = probe_round(1)
+        if verbose:
+            _print_time_probes(first_results)
+
+        if args.fast_expire:
+            if verbose:
+                print(f"[INFO] manager.reap_once() {wait_seconds:.1f}s ahead to exceed idle TTL")
+            manager.reap_once(now_monotonic=time.monotonic() + wait_seconds)
+        else:
+            if verbose:
+                print(f"[INFO] sleep {wait_seconds:.1f}s to exceed idle TTL...")
+            time.sleep(wait_seconds)
+
+            if not args.no_reap:
+                if verbose:
+                    print("[INFO] manager.reap_once()")
+                manager.reap_once()
+
+        reconnect_results = probe_round(2)
+        if verbose:
+            _print_time_probes(reconnect_results)
         print("[PASS] reconnect after idle TTL succeeded.")
+
+        if args.iterations > 1:
+            # Only round #2 pays the reconnect; later rounds reuse the session and measure steady-state requests.
+            samples_ns = [result.request_ns for result in reconnect_results]
+            for round_no in range(3, args.iterations + 2):
+                samples_ns.extend(result.request_ns for result in probe_round(round_no))
+            _print_request_percentiles(samples_ns)
         return 0
     except Exception as exc:  # noqa: BLE001
         print(f"[FAIL] {exc.__class__.__name__}: {exc}", file=sys.stderr)
         return 2
     finally:
+        executor.shutdown(wait=False, cancel_futures=True)
         close_ib_session_manager()
 
 